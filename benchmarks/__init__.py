@@ -0,0 +1,3 @@
+"""
+We need this file to indicate benchmarks/ is a module
+"""
@@ -0,0 +1,481 @@
+"""Benchmarks for the Automaton class. Run from root of repository with
+python -m benchmarks.automaton_benchmark"""
+
+import io
+import random
+import time
+import tracemalloc
+from functools import partial
+from typing import Callable, List, Set, Tuple
+from src.automaton.automaton import Automaton
+from src.automaton.bit_nfa import BitParallelNFA
+from src.automaton.frozen_nfa import FrozenNFA
+from src.automaton.multi_matcher import MultiMatcher
+from src.regexpr.lexer import Lexer
+from src.regexpr.reg_expr import RegExpr
+
+def random_dfa(size: int, alphabet: str = "ab", seed: int = 0) -> Automaton:
+    """Creates a total deterministic automaton with {size} states and random transitions."""
+    rand: random.Random = random.Random(seed)
+    auto: Automaton = Automaton()
+    for i in range(size):
+        auto.add_state(str(i))
+    auto.set_start("0")
+    for i in range(size):
+        for letter in alphabet:
+            auto.add_transition(str(i), letter, str(rand.randrange(size)))
+        if rand.random() < 0.5:
+            auto.make_state_final(str(i))
+    return auto
+
+def random_words(count: int, length: int, alphabet: str = "ab", seed: int = 0) -> List[str]:
+    """Creates {count} random words with length {length}."""
+    rand: random.Random = random.Random(seed)
+    return ["".join(rand.choice(alphabet) for _ in range(length)) for _ in range(count)]
+
+def measure(function: Callable[[], object]) -> float:
+    """Returns the running time of {function} in seconds."""
+    start: float = time.perf_counter()
+    function()
+    return time.perf_counter() - start
+
+def bench_compile() -> None:
+    """Compares Automaton.accepts_word with FrozenDFA.matches on a 10k-state DFA."""
+    auto: Automaton = random_dfa(10000)
+    words: List[str] = random_words(1000, 100)
+    frozen_time: float = measure(auto.compile)
+    frozen = auto.compile()
+    accepts_time: float = measure(lambda: [auto.accepts_word(word) for word in words])
+    matches_time: float = measure(lambda: [frozen.matches(word) for word in words])
+    print(f"compile (10k states): {frozen_time:.3f}s")
+    print(f"accepts_word x1000: {accepts_time:.3f}s, matches x1000: {matches_time:.3f}s")
+
+def bench_accepts_words() -> None:
+    """Compares a loop of Automaton.accepts_word with Automaton.accepts_words. The
+    non-deterministic automaton for (a+b)*a(a+b)^17 is not determinized."""
+    auto: Automaton = random_dfa(10000)
+    words: List[str] = random_words(20000, 40, seed=1)
+    loop_time: float = measure(lambda: [auto.accepts_word(word) for word in words])
+    batch_time: float = measure(lambda: auto.accepts_words(words))
+    print(f"accepts_word x20000: {loop_time:.3f}s, accepts_words: {batch_time:.3f}s")
+    nfa: Automaton = blowup_nfa(17)
+    print(f"accepts_words ((a+b)*a(a+b)^17) x20000:"
+          f" {measure(lambda: nfa.accepts_words(words)):.3f}s")
+
+def cyclic_dfa(size: int, seed: int = 0) -> Automaton:
+    """Creates a deterministic automaton with transitions i -a-> i+1, i -b-> i+2 (mod size)
+    and random final states. Its reverse is deterministic too, so the intermediate
+    automatons of Brzozowski's algorithm stay small."""
+    rand: random.Random = random.Random(seed)
+    auto: Automaton = Automaton()
+    for i in range(size):
+        auto.add_state(str(i))
+    auto.set_start("0")
+    for i in range(size):
+        auto.add_transition(str(i), "a", str((i + 1) % size))
+        auto.add_transition(str(i), "b", str((i + 2) % size))
+        if rand.random() < 0.5:
+            auto.make_state_final(str(i))
+    return auto
+
+def bench_minimize() -> None:
+    """Compares Hopcroft's and Brzozowski's minimization. Brzozowski's algorithm
+    is exponential on random DFAs, so the comparison is on cyclic ones."""
+    for size in [100, 1000]:
+        auto: Automaton = cyclic_dfa(size)
+        hopcroft_time: float = measure(auto.hopcroft_minimize)
+        brzozowski_time: float = measure(auto.brzozowski_minimize)
+        print(f"minimize (cyclic, {size} states): hopcroft {hopcroft_time:.3f}s,"
+              f" brzozowski {brzozowski_time:.3f}s")
+    for size in [1000, 10000, 100000]:
+        auto = random_dfa(size)
+        print(f"minimize (random, {size} states): hopcroft"
+              f" {measure(auto.hopcroft_minimize):.3f}s")
+
+def blowup_nfa(length: int) -> Automaton:
+    """Creates the automaton for (a+b)*a(a+b)^{length}. Its deterministic
+    version has 2^(length + 1) states."""
+    auto: Automaton = Automaton()
+    for i in range(length + 2):
+        auto.add_state(str(i))
+    auto.set_start("0")
+    auto.make_state_final(str(length + 1))
+    auto.add_transition("0", "a", "0")
+    auto.add_transition("0", "b", "0")
+    auto.add_transition("0", "a", "1")
+    for i in range(1, length + 1):
+        auto.add_transition(str(i), "a", str(i + 1))
+        auto.add_transition(str(i), "b", str(i + 1))
+    return auto
+
+def bench_determinize() -> None:
+    """Measures Automaton.determinize on the (a+b)*a(a+b)^n family."""
+    for length in [10, 12, 14, 16]:
+        auto: Automaton = blowup_nfa(length)
+        print(f"determinize ((a+b)*a(a+b)^{length}): {measure(auto.determinize):.3f}s")
+
+def bench_get_regex() -> None:
+    """Measures Automaton.get_regex and the length of its output."""
+    for size in [50, 100, 200]:
+        auto: Automaton = cyclic_dfa(size)
+        regex: List[str] = []
+        elapsed: float = measure(lambda regex=regex, auto=auto: regex.append(auto.get_regex()))
+        print(f"get_regex (cyclic, {size} states): {elapsed:.3f}s, {len(regex[0])} symbols")
+
+def bench_validate() -> None:
+    """Measures RegExpr.validate on long regexes."""
+    for count in [1000, 10000, 100000]:
+        regex: RegExpr = RegExpr("(" + "+".join(["ab*"] * count) + ")*(a+b)")
+        print(f"validate ({len(regex.regex)} symbols): {measure(regex.validate):.3f}s")
+
+def bench_regex_compile() -> None:
+    """Compares the Glushkov construction with the Kleene's theorem constructions."""
+    for count in [10, 20, 40]:
+        regex: RegExpr = RegExpr("+".join(f"a{'b' * i}a" for i in range(count)) + "(a+b)*")
+        glushkov_time: float = measure(regex.glushkov)
+        compile_time: float = measure(regex.compile)
+        kleene_time: float = measure(regex.kleene_compile)
+        print(f"regex compile ({len(regex.regex)} symbols): glushkov {glushkov_time:.3f}s,"
+              f" glushkov + minimize {compile_time:.3f}s, kleene {kleene_time:.3f}s")
+
+def bench_matches() -> None:
+    """Compares RegExpr.matches (lazy derivative DFA) with compiling the regex first."""
+    regex: RegExpr = RegExpr("(a+b)*a" + "(a+b)" * 12)
+    words: List[str] = random_words(2000, 50, seed=2)
+    first_time: float = measure(lambda: regex.matches(words[0]))
+    cold_time: float = measure(lambda: [regex.matches(word) for word in words])
+    warm_time: float = measure(lambda: [regex.matches(word) for word in words])
+    compile_time: float = measure(regex.compile)
+    print(f"matches ((a+b)*a(a+b)^12): first word {first_time:.3f}s,"
+          f" 2000 words {cold_time:.3f}s, again {warm_time:.3f}s, compile {compile_time:.3f}s")
+
+def bench_intersection() -> None:
+    """Measures Automaton.intersection. Only the reachable pairs are built: for two
+    cyclic automatons they are the n pairs (i, i), for random ones most of n^2."""
+    for size in [1000, 5000]:
+        auto: Automaton = cyclic_dfa(size)
+        other: Automaton = cyclic_dfa(size, seed=1)
+        print(f"intersection (cyclic, {size} x {size} states):"
+              f" {measure(partial(auto.intersection, other)):.3f}s")
+    auto = random_dfa(300)
+    other = random_dfa(300, seed=1)
+    print(f"intersection (random, 300 x 300 states):"
+          f" {measure(partial(auto.intersection, other)):.3f}s")
+
+def bench_equivalent() -> None:
+    """Measures Automaton.equivalent on a DFA and its minimal version and on two
+    different NFAs, where the first counterexample stops the search."""
+    auto: Automaton = random_dfa(10000)
+    minimal: Automaton = auto.minimize()
+    print(f"equivalent (random, 10k states vs minimal):"
+          f" {measure(lambda: auto.equivalent(minimal)):.3f}s")
+    nfa: Automaton = blowup_nfa(16)
+    other: Automaton = blowup_nfa(15)
+    print(f"distinguishing_word ((a+b)*a(a+b)^16 vs ^15):"
+          f" {measure(lambda: nfa.distinguishing_word(other)):.3f}s,"
+          f" determinize alone {measure(nfa.determinize):.3f}s")
+
+def bench_antichains() -> None:
+    """Measures the antichain algorithms on (a+b)*a(a+b)^n with a final starting state.
+    Its language is universal, but its deterministic version has 2^(n + 1) states."""
+    for length in [14, 40, 200]:
+        auto: Automaton = blowup_nfa(length)
+        auto.make_state_final("0")
+        other: Automaton = RegExpr("(ab+ba)*").glushkov()
+        universal_time: float = measure(auto.is_universal)
+        includes_time: float = measure(partial(auto.includes, other))
+        print(f"antichains ((a+b)*a(a+b)^{length} + $): is_universal {universal_time:.4f}s,"
+              f" includes (ab+ba)* {includes_time:.4f}s")
+    auto = blowup_nfa(14)
+    auto.make_state_final("0")
+    print(f"determinize ((a+b)*a(a+b)^14 + $): {measure(auto.determinize):.3f}s")
+
+def bench_remove_state() -> None:
+    """Measures removing half of the states of a random DFA one by one."""
+    for size in [1000, 10000]:
+        auto: Automaton = random_dfa(size)
+        labels: List[str] = [str(i) for i in range(0, size, 2)]
+        elapsed: float = measure(lambda auto=auto, labels=labels:
+                                 [auto.remove_state(label) for label in labels])
+        print(f"remove_state ({len(labels)} of {size} states): {elapsed:.3f}s")
+
+def bench_reverse() -> None:
+    """Compares Automaton.reverse with Automaton.reversed_view."""
+    auto: Automaton = random_dfa(100000)
+    print(f"reverse (random, 100k states): {measure(auto.reverse):.3f}s,"
+          f" reversed_view {measure(auto.reversed_view):.6f}s")
+
+def bench_copy() -> None:
+    """Measures the time and the peak memory of Automaton.copy and of chained Kleene
+    operations on random DFAs."""
+    auto: Automaton = random_dfa(20000)
+    other: Automaton = random_dfa(20000, seed=1)
+    operations: List[Callable[[], object]] = [
+        auto.copy, lambda: auto.union(other), lambda: auto.concat(other).star(),
+        lambda: auto.complement().left_arrow("1").right_arrow("2")]
+    for name, operation in zip(["copy", "union", "concat + star",
+                                "complement + left_arrow + right_arrow"], operations):
+        tracemalloc.start()
+        elapsed: float = measure(operation)
+        peak: int = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        print(f"{name} (random, 20k states): {elapsed:.3f}s, peak {peak / 2 ** 20:.1f} MiB")
+
+def bench_memory() -> None:
+    """Measures the memory per transition of Automaton and of Automaton.freeze
+    on a random NFA with 2 targets for every state and letter."""
+    size: int = 50000
+    rand: random.Random = random.Random(0)
+    tracemalloc.start()
+    auto: Automaton = Automaton()
+    for i in range(size):
+        auto.add_state(str(i))
+    auto.set_start("0")
+    for i in range(size):
+        for letter in "ab":
+            for _ in range(2):
+                auto.add_transition(str(i), letter, str(rand.randrange(size)))
+    editable: int = tracemalloc.get_traced_memory()[0]
+    frozen = auto.freeze()
+    compact: int = tracemalloc.get_traced_memory()[0] - editable
+    tracemalloc.stop()
+    count: int = frozen.transition_count()
+    print(f"memory per transition ({count} transitions): Automaton {editable / count:.0f}B,"
+          f" FrozenNFA {compact / count:.1f}B")
+    print(f"freeze: {measure(auto.freeze):.3f}s,"
+          f" from_frozen: {measure(lambda: Automaton.from_frozen(frozen)):.3f}s")
+
+def bench_from_edges() -> None:
+    """Compares building a random NFA with add_state/add_transition and with
+    Automaton.from_edges."""
+    size: int = 100000
+    rand: random.Random = random.Random(0)
+    edges: List[Tuple[int, str, int]] = [(state, letter, rand.randrange(size))
+                                         for state in range(size) for letter in "abab"]
+
+    def build() -> Automaton:
+        auto: Automaton = Automaton()
+        for state in range(size):
+            auto.add_state(str(state))
+        for source, letter, target in edges:
+            auto.add_transition(str(source), letter, str(target))
+        auto.set_start("0")
+        return auto
+
+    bulk_time: float = measure(lambda: Automaton.from_edges(size, edges, [0]))
+    print(f"build ({len(edges)} transitions): add_transition {measure(build):.3f}s,"
+          f" from_edges {bulk_time:.3f}s")
+
+def bench_trim() -> None:
+    """Measures Automaton.trim on the union of a random DFA with an automaton whose
+    states are all unreachable, and the time of compile and freeze before and after."""
+    auto: Automaton = random_dfa(50000)
+    junk: Automaton = random_dfa(50000, seed=1)
+    junk.remove_start("0")
+    mixed: Automaton = auto.union(junk).determinize()
+    mixed = mixed.union(junk)
+    before: List[float] = [measure(mixed.compile), measure(mixed.freeze)]
+    elapsed: float = measure(mixed.trim)
+    after: List[float] = [measure(mixed.compile), measure(mixed.freeze)]
+    print(f"trim ({mixed.trimmed} of {len(mixed.states) + mixed.trimmed} states removed):"
+          f" {elapsed:.3f}s, compile {before[0]:.3f}s -> {after[0]:.3f}s,"
+          f" freeze {before[1]:.3f}s -> {after[1]:.3f}s")
+
+def bench_stream() -> None:
+    """Compares Automaton.accepts_word on a long word with a Matcher reading the word
+    from a file object in 64 KiB chunks."""
+    text: str = random_words(1, 2000000)[0]
+    for name, auto in [("random DFA, 1000 states", random_dfa(1000)),
+                       ("NFA (a+b)*a(a+b)^10", blowup_nfa(10))]:
+        accepts_time: float = measure(partial(auto.accepts_word, text))
+        stream_time: float = measure(lambda auto=auto: auto.matcher().feed_file(io.StringIO(text)))
+        print(f"{name}, word of length 2M: accepts_word {accepts_time:.3f}s,"
+              f" matcher {stream_time:.3f}s")
+
+def bench_search() -> None:
+    """Compares Automaton.finditer with checking every subword with accepts_word."""
+    auto: Automaton = RegExpr("a(a+b)*bb+ba*c").compile()
+    text: str = random_words(1, 300, alphabet="abcd")[0]
+
+    def naive() -> int:
+        return sum(auto.accepts_word(text[start:end])
+                   for start in range(len(text)) for end in range(start, len(text) + 1))
+
+    print(f"find all (text of length 300): checking subwords {measure(naive):.3f}s,"
+          f" finditer {measure(lambda: list(auto.finditer(text))):.4f}s")
+    text = random_words(1, 1000000, alphabet="abcd")[0]
+    print(f"finditer (text of length 1M): {measure(lambda: list(auto.finditer(text))):.3f}s")
+
+def bench_multi_matcher() -> None:
+    """Compares checking words against 200 automatons one by one with MultiMatcher."""
+    patterns: List[str] = random_words(200, 6, alphabet="abc", seed=2)
+    automatons: List[Automaton] = [RegExpr(f"(a+b+c)*{pattern}(a+b+c)*").compile()
+                                   for pattern in patterns]
+    words: List[str] = random_words(1000, 60, alphabet="abc", seed=3)
+    matcher: MultiMatcher = MultiMatcher([auto.freeze() for auto in automatons], patterns)
+    loop_time: float = measure(lambda: [[auto.accepts_word(word) for auto in automatons]
+                                        for word in words])
+    multi_time: float = measure(lambda: [matcher.matches(word) for word in words])
+    print(f"200 automatons x 1000 words: accepts_word {loop_time:.3f}s,"
+          f" MultiMatcher {multi_time:.3f}s ({len(matcher)} product states built)")
+
+def bench_lexer() -> None:
+    """Compares Lexer with trying the compiled automaton of every rule on every
+    prefix of the rest of the text."""
+    rules: List[Tuple[str, str]] = [("IF", "if"), ("ID", "(a+b+c+f+i)(a+b+c+f+i+0+1)*"),
+                                    ("NUM", "(0+1)(0+1)*"), ("OP", "(a+b)(a+b)0")]
+    rand: random.Random = random.Random(4)
+    text: str = " ".join(rand.choice(["if", "abc1", "1010", "ab0", "fi", "c0c0c0c"])
+                         for _ in range(2000))
+    lexer: Lexer = Lexer(rules, skip=" ")
+    automatons: List[Automaton] = [RegExpr(regex).compile() for _, regex in rules]
+
+    def naive() -> int:
+        count: int = 0
+        for word in text.split(" "):
+            start: int = 0
+            while start < len(word):
+                end, _ = max((end, -index) for index, auto in enumerate(automatons)
+                             for end in range(start + 1, len(word) + 1)
+                             if auto.accepts_word(word[start:end]))
+                start, count = end, count + 1
+        return count
+
+    print(f"tokenize ({len(text)} symbols): trying every prefix {measure(naive):.3f}s,"
+          f" Lexer {measure(lambda: list(lexer.tokenize(text))):.4f}s")
+
+def bench_incremental() -> None:
+    """Compares checking a word of length 1M again after every edit near its end
+    with an IncrementalMatcher."""
+    auto: Automaton = random_dfa(1000)
+    letters: List[str] = list(random_words(1, 1000000)[0])
+    frozen = auto.compile()
+    rand: random.Random = random.Random(5)
+    edits: List[Tuple[int, str]] = [(rand.randrange(len(letters) - 100, len(letters)),
+                                     rand.choice("ab")) for _ in range(100)]
+
+    def again() -> None:
+        for position, letter in edits:
+            letters[position] = letter
+            frozen.matches("".join(letters))
+
+    matcher = auto.incremental_matcher()
+    build_time: float = measure(lambda: matcher.append("".join(letters)))
+
+    def incremental() -> None:
+        for position, letter in edits:
+            matcher.replace(position, position + 1, letter)
+            matcher.is_accepting()
+
+    print(f"100 edits near the end of a word of length 1M: FrozenDFA.matches {measure(again):.3f}s,"
+          f" IncrementalMatcher {measure(incremental):.4f}s (first pass {build_time:.3f}s)")
+
+def bench_from_words() -> None:
+    """Compares building the minimal DFA of a word list with union and minimize and
+    with Automaton.from_words on sorted and shuffled words."""
+    rand: random.Random = random.Random(6)
+    words: List[str] = sorted({"".join(rand.choice("abcdefghij")
+                                       for _ in range(rand.randrange(3, 12)))
+                               for _ in range(500000)})
+
+    def by_word(word: str) -> Automaton:
+        auto: Automaton = Automaton.by_letter(word[0])
+        for letter in word[1:]:
+            auto = auto.concat(Automaton.by_letter(letter))
+        return auto
+
+    def by_union(count: int) -> Automaton:
+        auto: Automaton = by_word(words[0])
+        for word in words[1:count]:
+            auto = auto.union(by_word(word))
+        return auto.minimize()
+
+    shuffled: List[str] = words[:]
+    rand.shuffle(shuffled)
+    print(f"minimal DFA of 500 words: union + minimize {measure(lambda: by_union(500)):.3f}s,"
+          f" from_words {measure(lambda: Automaton.from_words(words[:500])):.4f}s")
+    print(f"minimal DFA of {len(words)} words: from_words sorted"
+          f" {measure(lambda: Automaton.from_words(words)):.3f}s,"
+          f" shuffled {measure(lambda: Automaton.from_words(shuffled)):.3f}s")
+
+def bench_levenshtein() -> None:
+    """Compares checking all the words within 2 edits of a word against a dictionary DFA
+    with LevenshteinMatcher.matches, for 10 misspelled words and 10 random words."""
+    alphabet: str = "abcdefghij"
+    rand: random.Random = random.Random(7)
+    words: List[str] = sorted({"".join(rand.choice(alphabet) for _ in range(8))
+                               for _ in range(50000)})
+    auto: Automaton = Automaton.from_words(words)
+    frozen = auto.compile()
+    queries: List[str] = [words[index][:3] + rand.choice(alphabet) + words[index][4:]
+                          + rand.choice(alphabet) for index in rand.sample(range(len(words)), 10)]
+    queries.extend(random_words(10, 8, alphabet, seed=8))
+
+    def edits(word: str) -> Set[str]:
+        result: Set[str] = {word[:index] + word[index + 1:] for index in range(len(word))}
+        for index in range(len(word) + 1):
+            for letter in alphabet:
+                result.add(word[:index] + letter + word[index:])
+                result.add(word[:index] + letter + word[index + 1:])
+        return result
+
+    def brute_force() -> List[bool]:
+        return [any(frozen.matches(candidate)
+                    for edited in edits(query) for candidate in edits(edited))
+                for query in queries]
+
+    matcher = auto.levenshtein_matcher()
+    print(f"20 queries within 2 edits in {len(words)} words: brute force"
+          f" {measure(brute_force):.3f}s, LevenshteinMatcher"
+          f" {measure(lambda: [matcher.matches(query, 2) for query in queries]):.3f}s")
+
+def random_nfa(size: int, targets: int, seed: int = 0) -> Automaton:
+    """Creates an automaton over {a, b} with {targets} random targets for every state
+    and letter and random final states."""
+    rand: random.Random = random.Random(seed)
+    edges: List[Tuple[int, str, int]] = [(state, letter, rand.randrange(size))
+                                         for state in range(size) for letter in "ab"
+                                         for _ in range(targets)]
+    finals: List[int] = [state for state in range(size) if rand.random() < 0.1]
+    return Automaton.from_edges(size, edges, [0], finals)
+
+def bench_bit_parallel() -> None:
+    """Compares Automaton.accepts_word and FrozenNFA.matches with BitParallelNFA on
+    random NFAs, which are not determinized. The NFA with 2000 states is too big for
+    the tables of partial unions."""
+    text: str = random_words(1, 500, seed=9)[0]
+    for size in [100, 500, 2000]:
+        auto: Automaton = random_nfa(size, 2)
+        frozen: FrozenNFA = auto.freeze()
+        bits: BitParallelNFA = auto.bit_parallel()
+        print(f"random NFA, {size} states, word of length 500: accepts_word"
+              f" {measure(partial(auto.accepts_word, text)):.3f}s, FrozenNFA.matches"
+              f" {measure(partial(frozen.matches, text)):.4f}s, BitParallelNFA"
+              f" {measure(partial(bits.matches, text)):.4f}s")
+
+if __name__ == "__main__":
+    bench_compile()
+    bench_accepts_words()
+    bench_minimize()
+    bench_determinize()
+    bench_get_regex()
+    bench_validate()
+    bench_regex_compile()
+    bench_matches()
+    bench_intersection()
+    bench_equivalent()
+    bench_antichains()
+    bench_remove_state()
+    bench_reverse()
+    bench_copy()
+    bench_memory()
+    bench_from_edges()
+    bench_trim()
+    bench_stream()
+    bench_search()
+    bench_multi_matcher()
+    bench_lexer()
+    bench_incremental()
+    bench_from_words()
+    bench_levenshtein()
+    bench_bit_parallel()
@@ -98,6 +98,8 @@ class ControlSection:
             self.outer_section.set_message("Automation created successfully.")
         except KeyError as error:
             self.outer_section.set_message(error.args[0])
+        except ValueError as error:
+            self.outer_section.set_message(error.args[0])
 
     def remove_auto(self, name: str) -> None:
         """Function that removes automaton in controller and hides
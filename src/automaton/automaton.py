@@ -1,21 +1,117 @@
 """Module providing the crusial functionality for the project."""
 
 from __future__ import annotations
-from typing import Set, Dict, List
-import copy
+from typing import (Callable, Deque, Dict, FrozenSet, Iterable, Iterator, List, Optional,
+                    Sequence, Set, Tuple, Union, cast)
+from collections import deque
+from itertools import chain
+from array import array
+import operator
 import os
+import sys
+from src.automaton.bit_nfa import BitParallelNFA
+from src.automaton.dictionary import DictionaryBuilder
+from src.automaton.elimination import StateElimination
+from src.automaton.frozen_dfa import FrozenDFA, DEAD_STATE
+from src.automaton.frozen_nfa import FrozenNFA
+from src.automaton.hopcroft import minimal_table
+from src.automaton.inclusion import (SubsetView, antichain_missing_word, distinguishing_word,
+                                     is_universal, missing_word)
+from src.automaton.levenshtein import LevenshteinMatcher
+from src.automaton.matcher import IncrementalMatcher, Matcher
+from src.automaton.product import DFATable, product_table
+from src.automaton.searcher import OTHER_LETTER, Searcher
+from src.automaton.state import Edges, State, StateTable
 
 AUTOMATON_NOT_DETERMINISTIC: str = "Automaton is not deterministic."
-
-class State:
-    """State in a nutshell"""
-    def __init__(self, label: str = "") -> None:
-        self.label = label
-    def change_label(self, label: str):
-        """Function that changes labels"""
-        self.label = label
-    def __repr__(self) -> str:
-        return self.label
+INVALID_STATE_ID: str = "State ID is not valid."
+INVALID_LABELS: str = "Labels must be unique and one for every state."
+
+def _dfa_table(auto: Automaton) -> DFATable:
+    """Returns the transitions of a deterministic automaton with the states
+    numbered in the order of their IDs."""
+    ids: Dict[State, int] = {state: index for index, state in enumerate(auto.states)}
+    return DFATable([{letter: ids[target] for letter, targets in
+                      auto.transitions.get(state, {}).items() for target in targets}
+                     for state in auto.states],
+                    [state in auto.finals for state in auto.states],
+                    ids[next(iter(auto.starts))] if auto.starts else DEAD_STATE)
+
+def _any_prefix(auto: Automaton) -> Automaton:
+    """Returns an automaton with language Σ*L(auto), where Σ includes all letters:
+    a new starting state loops with every letter and copies the transitions of the
+    starting states. The letters outside of the alphabet are OTHER_LETTER."""
+    result: Automaton = auto.copy()
+    loop: State = result.get_state(result.add_state())
+    for letter in chain(auto.alphabet, [OTHER_LETTER]):
+        _link(result, loop, letter, loop)
+    for start in auto.starts:
+        for letter, targets in auto.transitions.get(start, {}).items():
+            for target in targets:
+                _link(result, loop, letter, target)
+    if auto.starts & auto.finals:
+        result.finals.add(loop)
+    result.starts.add(loop)
+    return result
+
+def _link(auto: Automaton, state_1: State, letter: str, state_2: State) -> None:
+    """Adds the transition state_1 -> state_2 with {letter} to {auto} without
+    looking the states up by label."""
+    auto.alphabet.add(letter)
+    auto.transitions.writable(state_1).setdefault(letter, set()).add(state_2)
+    auto.predecessors.writable(state_2).setdefault(letter, set()).add(state_1)
+
+def _add_states(result: Automaton, auto: Automaton) -> Dict[State, State]:
+    """Adds a new state to {result} for every state of {auto} and copies its
+    transitions. A state keeps its label unless the label is taken. Returns the
+    new states. {auto} is not changed."""
+    states: Dict[State, State] = {state: result.get_state(result.add_state(state.label))
+                                  for state in auto.states}
+    for state, state_transitions in auto.transitions.items():
+        for letter, targets in state_transitions.items():
+            for target in targets:
+                _link(result, states[state], letter, states[target])
+    return states
+
+def _replace_states(auto: Automaton, replacements: Dict[State, State]) -> None:
+    """Replaces every state of {auto} with replacements[state] keeping the IDs.
+    The new rows of transitions are not shared with other automatons."""
+    auto.state_table = auto.state_table.replaced(replacements)
+    auto.transitions = auto.transitions.replaced(replacements)
+    auto.predecessors = auto.predecessors.replaced(replacements)
+    auto.starts = {replacements[state] for state in auto.starts}
+    auto.finals = {replacements[state] for state in auto.finals}
+
+def _trimmed(auto: Automaton, trim: bool) -> Automaton:
+    """Trims {auto} if {trim} is set and returns it."""
+    if trim:
+        auto.trim()
+    return auto
+
+def _add_edges(transitions: Edges, predecessors: Edges, slots: List[State],
+               edges: Iterable[Tuple[int, str, int]]) -> int:
+    """Adds the edges (source ID, letter, target ID) to the rows of {transitions} and
+    {predecessors}, which must not be shared. Returns the lowest ID in the edges."""
+    lowest: int = 0
+    for source, letter, target in edges:
+        state_1: State = slots[source]
+        state_2: State = slots[target]
+        lowest = min(lowest, source, target)
+        row: Optional[Dict[str, Set[State]]] = transitions.get(state_1)
+        if row is None:
+            transitions[state_1] = {letter: {state_2}}
+        elif letter in row:
+            row[letter].add(state_2)
+        else:
+            row[letter] = {state_2}
+        row = predecessors.get(state_2)
+        if row is None:
+            predecessors[state_2] = {letter: {state_1}}
+        elif letter in row:
+            row[letter].add(state_1)
+        else:
+            row[letter] = {state_1}
+    return lowest
 
 class Automaton:
     """The main class in the project. It holds the functionality an automaton should have:
@@ -28,106 +124,123 @@ class Automaton:
     def __init__(self) -> None:
         self.alphabet: Set[str] = set()
         self.starts: Set[State] = set()
-        self.states: List[State] = []
-        self.states_dict: Dict[str, int] = {}
-        self.transitions: Dict[State, Dict[str, Set[State]]] = {}
+        self.state_table: StateTable = StateTable()
+        # The rows of transitions and predecessors may be shared with copies of the
+        # automaton (see Edges). predecessors[q][letter] holds the states going to q
+        # with letter.
+        self.transitions: Edges = Edges()
+        self.predecessors: Edges = Edges()
         self.finals: Set[State] = set()
+        # Number of states removed by the last Automaton.trim.
+        self.trimmed: int = 0
+
+    @property
+    def states(self) -> List[State]:
+        """The states of the automaton in the order of their IDs."""
+        return self.state_table.states
 
-    def add_state(self, label: str = "") -> None:
-        """Function for adding state"""
-        label = str(len(self.states)) if not label or label in self.states_dict else label
-        self.states.append(State(label))
-        self.states_dict[label] = len(self.states) - 1
+    @property
+    def slots(self) -> List[Optional[State]]:
+        """slots[i] is the state with ID i or None if it was removed. IDs do not
+        change when states are removed, only Automaton.compact renumbers them."""
+        return self.state_table.slots
+
+    @property
+    def states_dict(self) -> Dict[str, int]:
+        """The IDs of the states by label."""
+        return self.state_table.states_dict
+
+    def add_state(self, label: str = "") -> str:
+        """Function for adding state. Returns its label."""
+        return self.state_table.add(label)
 
     def remove_state(self, label: str) -> bool:
-        """Removes state"""
-        index: int = self.states_dict[label] if label in self.states_dict else -1
-        if index >= len(self.states) or index < 0:
+        """Removes state. Only its own transitions and the transitions going to it
+        are visited. The ID of the state is left unused until Automaton.compact."""
+        removed: Optional[State] = self.state_table.find(label)
+        if removed is None:
             return False
 
         # If finals or starts include the state, remove it from there.
-        self.finals = {state for state in self.finals if state is not self.states[index]}
-        self.starts = {state for state in self.starts if state is not self.states[index]}
+        self.finals.discard(removed)
+        self.starts.discard(removed)
 
         # Remove the state transitions.
-        if self.states[index] in self.transitions:
-            del self.transitions[self.states[index]]
-        for state, transitions in self.transitions.items():
-            for letter in transitions:
-                if self.states[index] in transitions[letter]:
-                    transitions[letter].remove(self.states[index])
-
-        # Delete state from states.
-        self.states.pop(index)
-        del self.states_dict[label]
+        for letter, targets in self.transitions.drop(removed).items():
+            for target in targets:
+                self.predecessors.writable(target)[letter].discard(removed)
+        for letter, sources in self.predecessors.drop(removed).items():
+            for source in sources:
+                self.transitions.writable(source)[letter].discard(removed)
+
+        # Leave a tombstone in place of the state.
+        self.state_table.remove(label)
         return True
 
+    def compact(self) -> None:
+        """Drops the IDs of the removed states, so the IDs become 0, 1, ... again."""
+        self.state_table.compact()
+
     def make_state_final(self, label: str) -> bool:
         """State becomes final"""
-        index: int = self.states_dict[label] if label in self.states_dict else -1
-        if index < 0 or index >= len(self.states) or self.states[index] in self.finals:
+        state: Optional[State] = self.state_table.find(label)
+        if state is None or state in self.finals:
             return False
-        self.finals.add(self.states[index])
+        self.finals.add(state)
         return True
 
     def make_state_unfinal(self, label: str) -> bool:
         """State becomes final"""
-        index: int = self.states_dict[label] if label in self.states_dict else -1
-        if index < 0 or index >= len(self.states) or not self.states[index] in self.finals:
+        state: Optional[State] = self.state_table.find(label)
+        if state is None or state not in self.finals:
             return False
-        self.finals.remove(self.states[index])
+        self.finals.remove(state)
         return True
 
     def set_start(self, label: str) -> bool:
         """Setting start state"""
-        index: int = self.states_dict[label] if label in self.states_dict else -1
-        if index < 0 or self.states[index] in self.starts:
+        state: Optional[State] = self.state_table.find(label)
+        if state is None or state in self.starts:
             return False
-        self.starts.add(self.states[index])
+        self.starts.add(state)
         return True
 
     def remove_start(self, label: str) -> bool:
         """Removing start state"""
-        index: int = self.states_dict[label] if label in self.states_dict else -1
-        if index < 0 or self.states[index] not in self.starts:
+        state: Optional[State] = self.state_table.find(label)
+        if state is None or state not in self.starts:
             return False
-        self.starts.remove(self.states[index])
+        self.starts.remove(state)
         return True
 
     def __add_transition_by_index(self, idx1: int, letter: str, idx2: int) -> bool:
-        """Adding new transition from state with index idx1 to state
-        with index idx2 with letter 'letter'"""
-        # If indexes are not valid, return.
-        if idx1 < 0 or idx1 >= len(self.states):
+        """Adding new transition from state with ID idx1 to state
+        with ID idx2 with letter 'letter'"""
+        # If IDs are not valid, return.
+        if idx1 < 0 or idx1 >= len(self.slots) or idx2 < 0 or idx2 >= len(self.slots):
             return False
-        if idx2 < 0 or idx2 >= len(self.states):
+        state_1: Optional[State] = self.slots[idx1]
+        state_2: Optional[State] = self.slots[idx2]
+        if state_1 is None or state_2 is None:
             return False
 
         # If letter is not in alphabet, add it.
         if letter not in self.alphabet:
             self.alphabet.add(letter)
 
-        state_1: State = self.states[idx1]
-        state_2: State = self.states[idx2]
-
-        # Add the transition
-        if state_1 not in self.transitions:
-            self.transitions[state_1] = {letter: set([state_2])}
-        elif letter not in self.transitions[state_1]:
-            self.transitions[state_1][letter] = set([state_2])
         # It is not allowed to have two same transitions in automaton.
-        elif state_2 in self.transitions[state_1][letter]:
+        if state_2 in self.transitions.get(state_1, {}).get(letter, ()):
             return False
-        else:
-            self.transitions[state_1][letter].add(state_2)
+        # Add the transition
+        self.transitions.writable(state_1).setdefault(letter, set()).add(state_2)
+        self.predecessors.writable(state_2).setdefault(letter, set()).add(state_1)
         return True
 
     def add_transition(self, label1: str, letter: str, label2: str) -> bool:
         """Adding new transition from state with index idx1 to state
         with index idx2 with letter 'letter'"""
-        idx1: int = self.states_dict[label1] if label1 in self.states_dict else -1
-        idx2: int = self.states_dict[label2] if label2 in self.states_dict else -1
-        return self.__add_transition_by_index(idx1, letter, idx2)
+        return self.__add_transition_by_index(self.states_dict.get(label1, -1), letter,
+                                              self.states_dict.get(label2, -1))
 
     def add_transitions(self, label1: str, letter, states: Set[State]) -> bool:
         """Adds many transitions at a time."""
@@ -139,26 +252,25 @@ class Automaton:
 
     def remove_transition(self, label1: str, letter: str, label2: str) -> bool:
         """Removes transition."""
-        if self.get_state(label1) not in self.transitions\
-             or letter not in self.transitions[self.get_state(label1)]\
-            or label2 not in self.states_dict\
-                or self.get_state(label2) not in self.transitions[self.get_state(label1)][letter]:
+        state_1: Optional[State] = self.state_table.find(label1)
+        state_2: Optional[State] = self.state_table.find(label2)
+        if state_1 is None or state_2 is None\
+            or state_2 not in self.transitions.get(state_1, {}).get(letter, ()):
             return False
-        self.transitions[self.get_state(label1)][letter].remove(self.get_state(label2))
+        self.transitions.writable(state_1)[letter].remove(state_2)
+        self.predecessors.writable(state_2)[letter].remove(state_1)
         return True
 
-    def __get_state_transitions_by_index(self, index: int) -> Dict[str, Set[State]]:
-        """Get transitions of state with index 'index'. It is a helper function
-        for Automaton.get_state_transitions."""
-        if index < 0 or index >= len(self.states):
-            return {}
-        state: State = self.states[index]
-        return self.transitions[state] if state in self.transitions else {}
-
     def get_state_transitions(self, state: State) -> Dict[str, Set[State]]:
-        """Get transitions of state with index 'index'."""
-        return self.__get_state_transitions_by_index(self.states_dict[state.label]\
-            if state.label in self.states_dict else -1)
+        """Get transitions of the state with the label of {state}."""
+        found: Optional[State] = self.state_table.find(state.label)
+        return {} if found is None else self.transitions.get(found, {})
+
+    def get_state_predecessors(self, state: State) -> Dict[str, Set[State]]:
+        """Get the transitions going to the state with the label of {state}:
+        the result maps every letter to the states going to it with the letter."""
+        found: Optional[State] = self.state_table.find(state.label)
+        return {} if found is None else self.predecessors.get(found, {})
 
     def accepts_word(self, word: str) -> bool:
         """Checks if word is in the automaton language."""
@@ -175,9 +287,187 @@ class Automaton:
                 return True
         return False
 
+    def compile(self) -> FrozenDFA:
+        """Returns an immutable array-backed version of the automaton for fast
+        word checking. The automaton must be deterministic."""
+        if len(self.starts) > 1 or not self.is_deterministic():
+            raise ValueError(AUTOMATON_NOT_DETERMINISTIC)
+        alphabet: List[str] = sorted(self.alphabet)
+        letters: Dict[str, int] = {letter: code for code, letter in enumerate(alphabet)}
+        ids: Dict[State, int] = {state: index for index, state in enumerate(self.states)}
+
+        # Missing transitions lead to the dead state.
+        table: array = array("i", [DEAD_STATE]) * (len(self.states) * len(alphabet))
+        for state, state_transitions in self.transitions.items():
+            row: int = ids[state] * len(alphabet)
+            for letter, targets in state_transitions.items():
+                for target in targets:
+                    table[row + letters[letter]] = ids[target]
+
+        start: int = ids[next(iter(self.starts))] if self.starts else DEAD_STATE
+        finals: bytes = bytes(state in self.finals for state in self.states)
+        return FrozenDFA(tuple(alphabet), table, start, finals,
+                         tuple(state.label for state in self.states))
+
+    def freeze(self) -> FrozenNFA:
+        """Returns an immutable compact version of the automaton with integer states
+        and letters (see FrozenNFA). Automaton.from_frozen converts it back."""
+        alphabet: List[str] = sorted(self.alphabet)
+        ids: Dict[State, int] = {state: index for index, state in enumerate(self.states)}
+        offsets: array = array("i", [0])
+        targets: array = array("i")
+        for state in self.states:
+            state_transitions: Dict[str, Set[State]] = self.transitions.get(state, {})
+            for letter in alphabet:
+                targets.extend(sorted(ids[target]
+                                      for target in state_transitions.get(letter, ())))
+                offsets.append(len(targets))
+        starts: array = array("i", sorted(ids[state] for state in self.starts))
+        finals: bytes = bytes(state in self.finals for state in self.states)
+        return FrozenNFA(tuple(alphabet), (offsets, targets), starts, finals,
+                         tuple(state.label for state in self.states))
+
+    def matcher(self) -> Matcher:
+        """Returns a Matcher which reads words chunk by chunk. Deterministic automatons
+        are compiled and the others are frozen (see Automaton.compile and freeze).
+        A trimmed copy is used, so states like the trash state of a total automaton
+        are dead and the matcher knows as soon as no word can be accepted."""
+        trimmed: Automaton = self.copy()
+        trimmed.trim()
+        deterministic: bool = len(trimmed.starts) <= 1 and trimmed.is_deterministic()
+        return Matcher(trimmed.compile() if deterministic else trimmed.freeze())
+
+    def bit_parallel(self) -> BitParallelNFA:
+        """Returns a BitParallelNFA which checks words without determinizing the
+        automaton: the sets of reached states are integer bitmasks."""
+        return BitParallelNFA(self.freeze())
+
+    def incremental_matcher(self, max_checkpoints: int = 4096) -> IncrementalMatcher:
+        """Returns an IncrementalMatcher for checking a word after every edit.
+        The automaton is compiled or frozen like in Automaton.matcher."""
+        return IncrementalMatcher(self.matcher().frozen, max_checkpoints)
+
+    def levenshtein_matcher(self) -> LevenshteinMatcher:
+        """Returns a LevenshteinMatcher for finding the words of the language closest
+        to given words. The automaton is frozen, so it can be reused for many words."""
+        return LevenshteinMatcher(self.freeze())
+
+    def closest_word(self, word: str, max_distance: Optional[int] = None)\
+            -> Optional[Tuple[int, str]]:
+        """Returns the smallest edit distance between {word} and a word of the language
+        together with such a word, or None if there is no word within {max_distance}
+        edits (see LevenshteinMatcher)."""
+        return self.levenshtein_matcher().closest(word, max_distance)
+
+    def accepts_approximately(self, word: str, max_distance: int) -> bool:
+        """Checks if a word of the language is within {max_distance} edits of {word}."""
+        return self.closest_word(word, max_distance) is not None
+
+    def searcher(self) -> Searcher:
+        """Returns a Searcher for the occurrences of words of the language in texts.
+        It keeps two DFAs: the trimmed determinized automaton and the determinized
+        automaton for Σ*L(self)^rev."""
+        forward: FrozenDFA = self.determinize(trim=True).compile()
+        backward: FrozenDFA = _any_prefix(self.reverse()).determinize().compile()
+        return Searcher(forward, backward)
+
+    def search(self, text: str) -> Optional[Tuple[int, int]]:
+        """Returns the span (start, end) of the leftmost-longest subword of {text}
+        in the automaton language or None if there is no such subword."""
+        return self.searcher().search(text)
+
+    def finditer(self, text: str) -> Iterator[Tuple[int, int]]:
+        """Yields the spans of the non-overlapping leftmost-longest subwords of {text}
+        in the automaton language. The text is read once backwards to find where the
+        subwords start and then forwards from every start (see Searcher)."""
+        return self.searcher().finditer(text)
+
+    def accepts_file(self, path: List[str], buffer_size: int = 1 << 16,
+                     encoding: str = "utf-8") -> bool:
+        """Checks if the contents of a file are a word in the automaton language.
+        The file is read {buffer_size} bytes at a time (see Matcher.feed_file)."""
+        with open(os.path.join(*path), "rb") as file:
+            return self.matcher().feed_file(file, buffer_size, encoding).is_accepting()
+
+    @staticmethod
+    def from_edges(size: int, edges: Iterable[Tuple[int, str, int]], starts: Iterable[int] = (),
+                   finals: Iterable[int] = (), labels: Optional[Sequence[str]] = None)\
+                       -> Automaton:
+        """Builds an automaton with states 0..size-1 in one pass. The edges are triples
+        (source ID, letter, target ID), e.g. zip(sources, letters, targets). The states
+        are labelled with their IDs unless {labels} are given. Unlike add_transition,
+        nothing is looked up by label and the alphabet is collected once at the end.
+        Raises ValueError if an ID is not in 0..size-1 or the labels are not valid."""
+        auto: Automaton = Automaton()
+        if labels is None:
+            labels = [str(index) for index in range(size)]
+        slots: List[State] = [State(sys.intern(label)) for label in labels]
+        auto.state_table = StateTable(cast(List[Optional[State]], slots))
+        if len(slots) != size or len(auto.states_dict) != size:
+            raise ValueError(INVALID_LABELS)
+
+        try:
+            # Negative IDs do not raise IndexError, so they are checked at the end.
+            lowest: int = _add_edges(auto.transitions, auto.predecessors, slots, edges)
+            start_ids: List[int] = list(starts)
+            final_ids: List[int] = list(finals)
+            auto.starts = {slots[start] for start in start_ids}
+            auto.finals = {slots[final] for final in final_ids}
+        except IndexError:
+            raise ValueError(INVALID_STATE_ID) from None
+        if min([lowest, *start_ids, *final_ids]) < 0:
+            raise ValueError(INVALID_STATE_ID)
+
+        for row in auto.transitions.values():
+            auto.alphabet.update(row)
+        auto.transitions.owned.update(auto.transitions)
+        auto.predecessors.owned.update(auto.predecessors)
+        return auto
+
+    @staticmethod
+    def from_words(words: Iterable[str]) -> Automaton:
+        """Builds the minimal deterministic automaton accepting exactly {words} in one
+        pass with DictionaryBuilder, without building the automaton of every word.
+        Sorted words are the fastest, but any order works. Without words the result
+        has no states."""
+        builder: DictionaryBuilder = DictionaryBuilder()
+        for word in words:
+            builder.add(word)
+        size, edges, finals = builder.finish()
+        return Automaton.from_edges(size, edges, [0] if size else [], finals)
+
+    @staticmethod
+    def from_frozen(frozen: Union[FrozenDFA, FrozenNFA]) -> Automaton:
+        """Returns an editable automaton with the states, transitions, starts
+        and finals of a frozen one."""
+        starts: Iterable[int] = frozen.starts if isinstance(frozen, FrozenNFA)\
+            else [frozen.start] if frozen.start != DEAD_STATE else []
+        auto: Automaton = Automaton.from_edges(
+            len(frozen.labels), frozen.edges(), starts,
+            (index for index, final in enumerate(frozen.finals) if final), frozen.labels)
+        auto.alphabet.update(frozen.alphabet)
+        return auto
+
+    def accepts_words(self, words: Iterable[str]) -> List[bool]:
+        """Checks which of the words are in the automaton language. Deterministic
+        automatons are compiled once. Non-deterministic ones are not determinized,
+        which may take exponential time, but run as a BitParallelNFA."""
+        if len(self.starts) <= 1 and self.is_deterministic():
+            return self.compile().matches_many(words)
+        return self.bit_parallel().matches_many(words)
+
     def copy(self) -> Automaton:
-        """Returns a deep copy of the automation"""
-        return copy.deepcopy(self)
+        """Returns a copy of the automaton. The states and the transitions of every state
+        are shared with self until one of the automatons changes them (copy-on-write),
+        so copying takes time linear in the number of states, not transitions."""
+        result: Automaton = Automaton()
+        result.alphabet = set(self.alphabet)
+        result.starts = set(self.starts)
+        result.state_table = self.state_table.copy()
+        result.transitions = self.transitions.share()
+        result.predecessors = self.predecessors.share()
+        result.finals = set(self.finals)
+        return result
 
     def is_deterministic(self) -> bool:
         """Checks if automaton is deterministic."""
@@ -202,15 +492,13 @@ class Automaton:
         """Makes automaton total."""
         if self.is_total():
             return
-        trash_label = "t" if "t" not in self.states_dict else str(len(self.states))
-        self.add_state(trash_label)
-        trash_state_idx = len(self.states) - 1
+        trash_label: str = self.add_state("t")
         for letter in self.alphabet:
-            self.__add_transition_by_index(trash_state_idx, letter, trash_state_idx)
+            self.add_transition(trash_label, letter, trash_label)
         for state in self.states:
             state_transitions: Dict[str, Set[State]] = self.get_state_transitions(state)
             for letter in self.alphabet:
-                if not letter in state_transitions:
+                if not state_transitions.get(letter):
                     self.add_transition(state.label, letter, trash_label)
 
     def total(self) -> Automaton:
@@ -221,64 +509,41 @@ class Automaton:
 
     def get_state(self, label: str) -> State:
         """Returns state by label."""
-        return self.states[self.states_dict[label]] if label in self.states_dict else State()
+        state: Optional[State] = self.state_table.find(label)
+        return State() if state is None else state
 
-    def union(self, auto: Automaton) -> Automaton:
-        """Unites automatons following the Kleene's theorem algorithm."""
-        if self is auto:
+    def union(self, auto: Automaton, trim: bool = False) -> Automaton:
+        """Unites automatons following the Kleene's theorem algorithm.
+        If {trim} is set, the result is trimmed (see Automaton.trim)."""
+        if self is auto and not trim:
             return self
         result: Automaton = self.copy()
-        other_auto: Automaton = auto.copy()
-        for state in other_auto.states:
-            if state.label in result.states_dict:
-                del other_auto.states_dict[state.label]
-                state.label = str(len(result.states))
-                other_auto.states_dict[state.label] = len(result.states)
-            result.add_state(state.label)
-        for state in other_auto.transitions:
-            for letter in other_auto.transitions[state]:
-                result.add_transitions(state.label, letter, other_auto.transitions[state][letter])
-        for final in other_auto.finals:
-            result.make_state_final(final.label)
-        for start in other_auto.starts:
-            result.set_start(start.label)
-        return result
-
-    def concat(self, auto) -> Automaton:
-        """Returns an automaton with language L(self) . L(auto)."""
-        result: Automaton = self.copy()
-        other_auto: Automaton = auto.copy()
-
+        if self is not auto:
+            states: Dict[State, State] = _add_states(result, auto)
+            result.finals.update(states[final] for final in auto.finals)
+            result.starts.update(states[start] for start in auto.starts)
+        return _trimmed(result, trim)
+
+    def concat(self, auto: Automaton, trim: bool = False) -> Automaton:
+        """Returns an automaton with language L(self) . L(auto).
+        If {trim} is set, the result is trimmed (see Automaton.trim)."""
         # The algorithm follows the Kleene construction literally.
-        # Renames all states in other_auto which have duplicate labels
-        # with labels in result and adds them in result.
-        for value in other_auto.states:
-            state: State = value
-            if state.label in result.states_dict:
-                del other_auto.states_dict[state.label]
-                state.label = str(len(result.states))
-                other_auto.states_dict[state.label] = len(result.states)
-            result.add_state(state.label)
+        # The states of auto are added in result (renamed if their labels are taken).
+        result: Automaton = self.copy()
+        states: Dict[State, State] = _add_states(result, auto)
 
         for final in result.finals:
-            for start in other_auto.starts:
-                start_transitions: Dict[str, Set[State]] = other_auto.transitions[start]\
-                     if start in other_auto.transitions else {}
-                for letter in start_transitions:
-                    result.add_transitions(final.label, letter, start_transitions[letter])
-
-        for state in other_auto.transitions:
-            for letter in other_auto.transitions[state]:
-                result.add_transitions(state.label, letter, other_auto.transitions[state][letter])
-
+            for start in auto.starts:
+                for letter, targets in auto.transitions.get(start, {}).items():
+                    for target in targets:
+                        _link(result, final, letter, states[target])
 
         # If there is a starting state amongst finals, the result finals are
         # self.finals U other.finals. Else result finals are other.finals.
-        if not set(other_auto.starts).intersection(set(other_auto.finals)):
+        if not auto.starts & auto.finals:
             result.finals = set()
-        for final in other_auto.finals:
-            result.make_state_final(final.label)
-        return result
+        result.finals.update(states[final] for final in auto.finals)
+        return _trimmed(result, trim)
 
     def complement(self) -> Automaton:
         """Returns automaton with complement language."""
@@ -293,9 +558,10 @@ class Automaton:
         result.finals = {state for state in result.states if state not in old_finals}
         return result
 
-    def star(self) -> Automaton:
+    def star(self, trim: bool = False) -> Automaton:
         """Returns automaton with language L(self)*.
-        The algorithm derives directly from Kleene's theorem."""
+        The algorithm derives directly from Kleene's theorem.
+        If {trim} is set, the result is trimmed (see Automaton.trim)."""
         result: Automaton = self.copy()
 
         # For every final f add transitions
@@ -309,144 +575,214 @@ class Automaton:
                     result.add_transitions(final.label, letter, transitions[letter])
 
         # Add a new state to add epsilon to L(result).
-        start_label = str(len(result.states))
-        result.add_state(start_label)
+        start_label: str = result.add_state(str(len(result.states)))
         result.starts.add(result.get_state(start_label))
         result.make_state_final(start_label)
+        return _trimmed(result, trim)
+
+    def product(self, other_auto: Automaton, accept: Callable[[bool, bool], bool]) -> Automaton:
+        """Returns the product of two deterministic automatons. The states are the
+        ordered pairs of states reachable from the pair of starting states and a pair
+        is final if {accept} returns True for the finality of its two components.
+        Missing transitions go to a dead component, so the alphabets may differ.
+        The states are labeled 0, 1, ... in BFS order (see product.product_table)."""
+        if len(self.starts) > 1 or not self.is_deterministic()\
+            or len(other_auto.starts) > 1 or not other_auto.is_deterministic():
+            raise ValueError(AUTOMATON_NOT_DETERMINISTIC)
+        alphabet: List[str] = sorted(self.alphabet | other_auto.alphabet)
+        rows, finals = product_table(_dfa_table(self), _dfa_table(other_auto), alphabet, accept)
+        result: Automaton = Automaton.from_edges(
+            len(rows), ((number, letter, target) for number, row in enumerate(rows)
+                        for letter, target in row),
+            [0], [number for number, final in enumerate(finals) if final])
+        result.alphabet.update(alphabet)
         return result
 
     def intersection(self, other_auto: Automaton) -> Automaton:
         """Returns an automaton with language L(self) ^ L(other_auto).
-        The algorithm uses the technique of parallel automatons processing
-        (the states are ordered pairs)."""
+        Both automatons must be deterministic (see Automaton.product)."""
+        return self.product(other_auto, operator.and_)
 
-        # The automatons must have same alphabet.
-        if len(set(self.alphabet).intersection(set(other_auto.alphabet))) != len(self.alphabet):
-            raise ValueError("Automations don't have same alphabet.")
+    def product_union(self, other_auto: Automaton) -> Automaton:
+        """Returns a deterministic automaton with language L(self) U L(other_auto).
+        Both automatons must be deterministic (see Automaton.product)."""
+        return self.product(other_auto, operator.or_)
 
-        # Both have to be deterministic.
-        if not self.is_deterministic() or not other_auto.is_deterministic():
-            raise ValueError(AUTOMATON_NOT_DETERMINISTIC)
-        result: Automaton = Automaton()
-        result.alphabet = set(self.alphabet)
+    def difference(self, other_auto: Automaton) -> Automaton:
+        """Returns an automaton with language L(self) \\ L(other_auto).
+        Both automatons must be deterministic (see Automaton.product)."""
+        return self.product(other_auto, lambda final_1, final_2: final_1 and not final_2)
 
-        # Adds result states as ordered pairs: states labels are
-        # {label_from_self}x{label_from_other} for all states
-        # from self and other_auto.
-        for state_1 in self.states:
-            for state_2 in other_auto.states:
-                result.add_state(f"{state_1.label}x{state_2.label}")
-        for state_1 in self.starts:
-            for state_2 in other_auto.starts:
-                result.set_start(f"{state_1.label}x{state_2.label}")
-
-        for state in result.states:
-            tokens: List[str] = state.label.split("x")
-            transitions_1: Dict[str, Set[State]] =\
-                 self.get_state_transitions(self.get_state(tokens[0]))
-            transitions_2: Dict[str, Set[State]] =\
-                 other_auto.get_state_transitions(other_auto.get_state(tokens[1]))
-
-            # forall q in self.states forall p in other.states
-            #   forall l in self.alphabet forall transitions t1 of q with
-            #       letter l forall transitions t2 of p with letter l:
-            #           t1, t2 are in delta("qxp", l)
-            # This the idea implemented below.
-            for letter in transitions_1:
-                if letter in transitions_2:
-                    for s_1 in transitions_1[letter]:
-                        for s_2 in transitions_2[letter]:
-                            result.add_transition(state.label, letter, f"{s_1.label}x{s_2.label}")
-
-        # Both components have to be starting states in order to make the pair starting.
-        result.starts = {state for state in result.states
-            if self.states[self.states_dict[state.label.split("x")[0]]] in self.starts
-                and other_auto.states[self.states_dict[state.label.split("x")[1]]]\
-                    in other_auto.starts}
-
-        # Analogically for the final states.
-        result.finals = {state for state in result.states
-            if self.states[self.states_dict[state.label.split("x")[0]]] in self.finals
-                and other_auto.states[self.states_dict[state.label.split("x")[1]]]\
-                    in other_auto.finals}
-        return result
+    def symmetric_difference(self, other_auto: Automaton) -> Automaton:
+        """Returns an automaton with the words in exactly one of L(self) and L(other_auto).
+        Both automatons must be deterministic (see Automaton.product)."""
+        return self.product(other_auto, operator.xor)
 
     def rename(self) -> None:
-        """Renames states."""
-        count: int = 0
-        self.states_dict = {}
+        """Renames states to their IDs after compaction. The states may be shared
+        with copies of the automaton, so they are replaced with new ones."""
+        self.compact()
+        renamed: Dict[State, State] = {state: State(str(index))
+                                       for index, state in enumerate(self.states)}
+        _replace_states(self, renamed)
+
+    def subset_view(self, alphabet: List[str]) -> SubsetView:
+        """Returns the determinized automaton without building it (see
+        inclusion.SubsetView). The states are numbered in the order of their IDs
+        and letters are indexes in {alphabet}."""
+        ids: Dict[State, int] = {state: index for index, state in enumerate(self.states)}
+        successors: List[List[Tuple[int, ...]]] = []
         for state in self.states:
-            state.label = str(count)
-            self.states_dict[state.label] = count
-            count += 1
-
-    def determinize(self) -> Automaton:
+            state_transitions: Dict[str, Set[State]] = self.transitions.get(state, {})
+            successors.append([tuple(ids[target] for target in state_transitions.get(letter, ()))
+                               for letter in alphabet])
+        return SubsetView(frozenset(ids[state] for state in self.starts), successors,
+                          {ids[state] for state in self.finals})
+
+    def distinguishing_word(self, other_auto: Automaton) -> Optional[str]:
+        """Returns a shortest word which is in exactly one of L(self) and L(other_auto),
+        or None if the automatons are equivalent (see inclusion.distinguishing_word).
+        Non-deterministic automatons are determinized lazily."""
+        alphabet: List[str] = sorted(self.alphabet | other_auto.alphabet)
+        return distinguishing_word(self.subset_view(alphabet), other_auto.subset_view(alphabet),
+                                   alphabet)
+
+    def equivalent(self, other_auto: Automaton) -> bool:
+        """Checks if L(self) = L(other_auto) (see Automaton.distinguishing_word)."""
+        return self.distinguishing_word(other_auto) is None
+
+    def missing_word(self, other_auto: Automaton) -> Optional[str]:
+        """Returns a shortest word from L(other_auto) which is not in L(self), or None if
+        L(other_auto) is a subset of L(self) (see inclusion.missing_word). If self is not
+        deterministic, the antichain algorithm is used (see inclusion.antichain_missing_word)."""
+        alphabet: List[str] = sorted(self.alphabet | other_auto.alphabet)
+        view: SubsetView = self.subset_view(alphabet)
+        other_view: SubsetView = other_auto.subset_view(alphabet)
+        if len(self.starts) > 1 or not self.is_deterministic():
+            return antichain_missing_word(view, other_view, alphabet)
+        return missing_word(view, other_view, alphabet)
+
+    def includes(self, other_auto: Automaton) -> bool:
+        """Checks if L(other_auto) is a subset of L(self) (see Automaton.missing_word)."""
+        return self.missing_word(other_auto) is None
+
+    def is_universal(self) -> bool:
+        """Checks if every word over the alphabet of the automaton is in its language.
+        The subsets of the determinized automaton are explored lazily
+        (see inclusion.is_universal)."""
+        return is_universal(self.subset_view(sorted(self.alphabet)), len(self.alphabet))
+
+    def determinize(self, trim: bool = False) -> Automaton:
         """Returns a determinized version of self. The algorithm is
-        derived from the Rabin-Scott theorem."""
-        result: Automaton = Automaton()
-        result.alphabet = set(self.alphabet)
-
-        queue: List[Set[State]] = []
-        queue.append(self.starts)
-        start_label: str = str(sorted({state.label for state in self.starts}))
-        result.add_state(start_label)
-        result.set_start(start_label)
-
-        if len([state for state in self.starts if state in self.finals]) > 0:
-            result.make_state_final(start_label)
-
-        while queue:
-            current: Set[State] = queue.pop(0)
-            for letter in result.alphabet:
-                states_set: Set[State] = set()
-
-                for state in current:
-                    transitions: Dict[str, Set[State]] = self.get_state_transitions(state)
-                    states_set = states_set.union(transitions[letter] if letter in transitions\
-                         else set())
-
-                set_label: str = str(sorted({state.label for state in states_set}))
-
-                if not result.get_state(set_label).label:
-                    queue.append(states_set)
-                    result.add_state(set_label)
-                    if [state for state in states_set if state in self.finals]:
-                        result.make_state_final(set_label)
-
-                result.add_transition(str(sorted(\
-                    {state.label for state in current})), letter, set_label)
-
-        result.rename()
-
-        return result
+        derived from the Rabin-Scott theorem. Subsets of states are frozensets
+        of state numbers and are labeled 0, 1, ... in BFS order at the end.
+        If {trim} is set, the result is trimmed (see Automaton.trim), which drops
+        the empty subset among others."""
+        alphabet: List[str] = sorted(self.alphabet)
+        view: SubsetView = self.subset_view(alphabet)
+        successors: List[List[Tuple[int, ...]]] = view.successors
+        numbers: Dict[FrozenSet[int], int] = {view.start: 0}
+        subsets: Deque[FrozenSet[int]] = deque([view.start])
+        edges: List[Tuple[int, str, int]] = []
+
+        # Subsets are numbered when first seen, so they leave the queue in the order
+        # of their numbers.
+        while subsets:
+            current: FrozenSet[int] = subsets.popleft()
+            for code, letter in enumerate(alphabet):
+                target: FrozenSet[int] = frozenset(chain.from_iterable(
+                    successors[state][code] for state in current))
+                number: Optional[int] = numbers.get(target)
+                if number is None:
+                    number = numbers[target] = len(numbers)
+                    subsets.append(target)
+                edges.append((numbers[current], letter, number))
+
+        result: Automaton = Automaton.from_edges(
+            len(numbers), edges, [0],
+            [number for subset, number in numbers.items() if view.accepts(subset)])
+        result.alphabet.update(self.alphabet)
+        return _trimmed(result, trim)
 
     def minimize(self) -> Automaton:
+        """Return a minimized automaton with same language. Deterministic automatons
+        are minimized with Hopcroft's algorithm, non-deterministic ones with Bzozowski's."""
+        if len(self.starts) <= 1 and self.is_deterministic():
+            return self.hopcroft_minimize()
+        return self.brzozowski_minimize()
+
+    def brzozowski_minimize(self) -> Automaton:
         """Return a minimized automaton with same language.
         The algorithm follows the Bzozowski theorem: The determinized version
         of the automaton created with the construction for L(auto)^rev is
          the minimal automaton for L^rev."""
-        return self.copy().determinize().reverse().determinize().reverse().determinize()
+        return self.determinize().reversed_view().determinize().reversed_view().determinize()
+
+    def __reachable_table(self, alphabet: List[str]) -> Tuple[List[List[int]], List[bool]]:
+        """Numbers the reachable states of a deterministic automaton in BFS order
+        (the start is 0) and returns their transition table and which of them are final.
+        An extra trash state (the last one) replaces the missing transitions."""
+        ids: Dict[State, int] = {state: index for index, state in enumerate(self.starts)}
+        queue: Deque[State] = deque(ids)
+        while queue:
+            state_transitions: Dict[str, Set[State]] = self.transitions.get(queue.popleft(), {})
+            for letter in alphabet:
+                for target in state_transitions.get(letter, ()):
+                    if target not in ids:
+                        ids[target] = len(ids)
+                        queue.append(target)
+
+        trash: int = len(ids)
+        table: List[List[int]] = []
+        for state in ids:
+            state_transitions = self.transitions.get(state, {})
+            table.append([next((ids[target] for target in state_transitions.get(letter, ())),
+                               trash) for letter in alphabet])
+        table.append([trash] * len(alphabet))
+        return table, [state in self.finals for state in ids] + [False]
+
+    def hopcroft_minimize(self) -> Automaton:
+        """Returns the minimal total automaton for a deterministic automaton.
+        Unreachable states are dropped and dead states are put in a single block before
+        Hopcroft's partition refinement (see hopcroft.minimal_table)."""
+        if len(self.starts) > 1 or not self.is_deterministic():
+            raise ValueError(AUTOMATON_NOT_DETERMINISTIC)
+        alphabet: List[str] = sorted(self.alphabet)
+        table, finals = minimal_table(*self.__reachable_table(alphabet))
+        result: Automaton = Automaton.from_edges(
+            len(table), ((state, alphabet[code], target) for state, row in enumerate(table)
+                         for code, target in enumerate(row)),
+            [0], [state for state, final in enumerate(finals) if final])
+        result.alphabet.update(self.alphabet)
+        return result
 
     def reverse(self) -> Automaton:
         """Returns an automaton with language L(self)^rev.
         The algorithm is as it follows:
         1. All finals become starts.
         2. All starts become finals.
-        3. Change the direction of transitions."""
-        result: Automaton = Automaton()
-        for state in self.states:
-            result.add_state(state.label)
-        for start in self.starts:
-            result.make_state_final(start.label)
-        for final in self.finals:
-            result.set_start(final.label)
-        for state in result.states:
-            transitions: Dict[str, Set[State]] = self.get_state_transitions(state)
-            for letter in transitions:
-                for res in transitions[letter]:
-                    result.add_transition(res.label, letter, state.label)
+        3. Change the direction of transitions.
+        The transitions of the result are copied from the predecessors index of self
+        and the other way around."""
+        result: Automaton = self.reversed_view()
+        result.alphabet = set(self.alphabet)
+        _replace_states(result, {state: State(state.label) for state in self.states})
         return result
 
+    def reversed_view(self) -> Automaton:
+        """Returns an automaton with language L(self)^rev which shares all of its
+        data with self: its transitions are the predecessors index of self and its
+        starts are the finals of self. Nothing is copied, so self must not be changed
+        while the view is used."""
+        view: Automaton = Automaton()
+        view.alphabet = self.alphabet
+        view.state_table = self.state_table
+        view.transitions = self.predecessors
+        view.predecessors = self.transitions
+        view.starts = self.finals
+        view.finals = self.starts
+        return view
+
     def left_arrow(self, label: str) -> Automaton:
         """Returns an automaton with language all the words that start from state {label}
         and when read in {self} automaton finish at final state."""
@@ -461,54 +797,47 @@ class Automaton:
         result.starts = {result.get_state(label)}
         return result
 
-    def _get_regex_language(self, start: State, final: State, upper_bound: int) -> str:
-        """Find the language L(i, j, n) from Kleene's algorithm."""
-
-        if upper_bound == 0:
-            regex_letters: str = "+".join([letter for letter in self.transitions[start]
-                                         if final in self.transitions[start][letter]])
-# 0 * a
-# | b
-# 1 * b
-# | a
-# 2 a, b
-            if start == final:
-                return "$+" + regex_letters
-            return regex_letters
-
-        regex_1: str = self._get_regex_language(start,
-                                                final,
-                                                upper_bound - 1)
-
-        regex_2: str = self._get_regex_language(start,
-                                                 self.states[upper_bound - 1],
-                                                 upper_bound - 1)
-
-        regex_3: str = self._get_regex_language(self.states[upper_bound - 1],
-                                                self.states[upper_bound - 1],
-                                                  upper_bound - 1)
-
-        regex_4: str = self._get_regex_language(self.states[upper_bound - 1],
-                                                 final,
-                                                 upper_bound - 1)
-
-        result: str = f"{regex_1}+({regex_2})({regex_3})*({regex_4})"
-        if [reg for reg in [regex_2, regex_4] if reg == '']:
-            result = regex_1
-        elif not regex_3:
-            result = f"{regex_1}+({regex_2})({regex_4})"
-
-        return result
-
-    def get_regex(self):
-        """Returns regex of the automaton using Kleene's algorithm."""
+    def get_regex(self) -> str:
+        """Returns regex of the automaton using the state elimination algorithm.
+        Useless states are dropped first and the state
+        whose elimination adds the least to the regexes is eliminated at every step."""
         if not self.is_deterministic():
             raise ValueError(AUTOMATON_NOT_DETERMINISTIC)
 
-        start: State = list(self.starts)[0]
-
-        return "+".join([self._get_regex_language(start, final, len(self.states))
-                             for final in self.finals])
+        # Keep only the states which are both reachable and co-reachable.
+        reachable: Set[State] = self.transitions.reachable(self.starts)
+        coreachable: Set[State] = self.predecessors.reachable(self.finals)
+        useful: List[State] = [state for state in self.states
+                               if state in reachable and state in coreachable]
+        ids: Dict[State, int] = {state: index for index, state in enumerate(useful)}
+        start: int = len(useful)
+        final: int = start + 1
+
+        graph: StateElimination = StateElimination(final + 1)
+        for state in useful:
+            for letter in sorted(self.transitions.get(state, {})):
+                for target in self.transitions[state][letter]:
+                    if target in ids:
+                        graph.add_edge(ids[state], ids[target], letter)
+            if state in self.starts:
+                graph.add_edge(start, ids[state], "$")
+            if state in self.finals:
+                graph.add_edge(ids[state], final, "$")
+        return graph.regex(range(len(useful)), start, final)
+
+    def trim(self) -> int:
+        """Removes the states which are not reachable from a starting state and the
+        states from which no final state is reachable. The language does not change.
+        Both searches and the removals take linear time. Returns the number of removed
+        states, which is also kept in Automaton.trimmed."""
+        reachable: Set[State] = self.transitions.reachable(self.starts)
+        coreachable: Set[State] = self.predecessors.reachable(self.finals)
+        useless: List[str] = [state.label for state in self.states
+                              if state not in reachable or state not in coreachable]
+        for label in useless:
+            self.remove_state(label)
+        self.trimmed = len(useless)
+        return self.trimmed
 
     @staticmethod
     def by_letter(letter: str) -> Automaton:
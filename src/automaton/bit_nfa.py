@@ -0,0 +1,107 @@
+"""Module providing a bit-parallel simulation of non-deterministic automatons."""
+
+from __future__ import annotations
+from typing import Dict, Iterable, List, Tuple
+from src.automaton.frozen_nfa import FrozenNFA
+
+# Automatons with at most MAX_TABLE_STATES states get tables of partial unions.
+MAX_TABLE_STATES: int = 512
+# BITS[b] holds the positions of the bits set in the byte b.
+BITS: Tuple[Tuple[int, ...], ...] = tuple(tuple(bit for bit in range(8) if byte >> bit & 1)
+                                          for byte in range(256))
+
+class BitParallelNFA:
+    """Runs a frozen automaton without determinizing it. A set of states is an integer
+    whose bit q is set if state q is in the set, so the step with a letter is an OR of
+    the successor masks of the active states, done on whole machine words by Python.
+    successors[c][q] is the mask of the states reached from q with letter number c.
+
+    For automatons with at most MAX_TABLE_STATES states, tables[c][k][b] is the union
+    of the successor masks of the states 8k..8k+7 selected by the byte b, so a step
+    takes one lookup per byte of the active set, whatever the number of active states
+    (the tables take 256 * n^2 / 64 bytes per letter). For bigger automatons the set
+    bits of every non-zero byte are visited one by one."""
+    __slots__ = ("alphabet", "letters", "size", "successors", "tables", "start", "finals")
+
+    def __init__(self, frozen: FrozenNFA) -> None:
+        self.alphabet: Tuple[str, ...] = frozen.alphabet
+        self.letters: Dict[str, int] = frozen.letters
+        self.size: int = len(frozen)
+        width: int = len(frozen.alphabet)
+        self.successors: List[List[int]] = [[0] * self.size for _ in range(width)]
+        for state in range(self.size):
+            for code in range(width):
+                row: int = state * width + code
+                mask: int = 0
+                for target in frozen.targets[frozen.offsets[row]:frozen.offsets[row + 1]]:
+                    mask |= 1 << target
+                self.successors[code][state] = mask
+        self.tables: List[List[List[int]]] = []
+        if self.size <= MAX_TABLE_STATES:
+            self.tables = [self.__table(masks) for masks in self.successors]
+        self.start: int = 0
+        for start in frozen.starts:
+            self.start |= 1 << start
+        self.finals: int = 0
+        for state, final in enumerate(frozen.finals):
+            if final:
+                self.finals |= 1 << state
+
+    @staticmethod
+    def __table(masks: List[int]) -> List[List[int]]:
+        """Returns the unions of the masks for every byte of every group of 8 states.
+        The union for b is the union for b without its lowest bit plus one mask."""
+        table: List[List[int]] = []
+        for base in range(0, len(masks), 8):
+            unions: List[int] = [0] * 256
+            for byte in range(1, 256):
+                low: int = (byte & -byte).bit_length() - 1
+                unions[byte] = unions[byte & (byte - 1)] | \
+                    (masks[base + low] if base + low < len(masks) else 0)
+            table.append(unions)
+        return table
+
+    def __len__(self) -> int:
+        return self.size
+
+    def step(self, active: int, letter: str) -> int:
+        """Returns the set of states reached from the set {active} with {letter}."""
+        code: int = self.letters.get(letter, -1)
+        if code < 0 or not active:
+            return 0
+        reached: int = 0
+        data: bytes = active.to_bytes((self.size + 7) // 8, "little")
+        if self.tables:
+            for unions, byte in zip(self.tables[code], data):
+                if byte:
+                    reached |= unions[byte]
+            return reached
+        masks: List[int] = self.successors[code]
+        for index, byte in enumerate(data):
+            if byte:
+                for bit in BITS[byte]:
+                    reached |= masks[index * 8 + bit]
+        return reached
+
+    def run(self, word: str, active: int = -1) -> int:
+        """Returns the set of states reached with the word from the set {active}
+        (the starting states by default)."""
+        if active < 0:
+            active = self.start
+        for letter in word:
+            active = self.step(active, letter)
+            if not active:
+                break
+        return active
+
+    def matches(self, word: str) -> bool:
+        """Checks if word is in the automaton language."""
+        return self.run(word) & self.finals != 0
+
+    def matches_many(self, words: Iterable[str]) -> List[bool]:
+        """Checks many words at once."""
+        return [self.matches(word) for word in words]
+
+    def __repr__(self) -> str:
+        return f"--- BitParallelNFA: {self.size} states, alphabet {list(self.alphabet)}," \
+            f" {'tables' if self.tables else 'no tables'}"
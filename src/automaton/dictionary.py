@@ -0,0 +1,182 @@
+"""Module for building minimal acyclic automatons from lists of words."""
+
+from __future__ import annotations
+from typing import Dict, FrozenSet, Iterator, List, Optional, Tuple
+
+ROOT: int = 0
+
+class DictionaryBuilder:
+    """Builds the minimal DFA of a finite set of words, adding the words one by one
+    (Daciuk et al., Incremental construction of minimal acyclic finite-state automata).
+    The states are the integers in transitions; freed numbers are kept in {free} and
+    reused. A state is registered when no more words change it: {register} maps the
+    signature of a registered state (is it final, its transitions) to the state, so an
+    equivalent state is found with one lookup and the automaton is always minimal
+    apart from the states still being built.
+
+    While the words come sorted, only the states on the path of the previous word can
+    change: when a word leaves the path, the rest of the path is registered from its
+    end. The first word smaller than the previous one switches to the variant for
+    unsorted words: the path of the new word is registered again after every word and
+    the states on it reached by more than one transition are cloned first, so the other
+    words going through them stay as they are."""
+
+    def __init__(self) -> None:
+        self.transitions: List[Dict[str, int]] = [{}]
+        self.finals: bytearray = bytearray(1)
+        # indegree[q] is the number of transitions to state q.
+        self.indegree: List[int] = [0]
+        self.free: List[int] = []
+        self.register: Dict[Tuple[int, FrozenSet[Tuple[str, int]]], int] = {}
+        self.previous: str = ""
+        # path[i] is the state reached with previous[:i], the states after
+        # path[len(common prefix)] are not registered yet. The path is empty
+        # once the words are not sorted.
+        self.path: List[int] = [ROOT]
+
+    @property
+    def sorted(self) -> bool:
+        """Checks if the words added so far came sorted."""
+        return bool(self.path)
+
+    def __len__(self) -> int:
+        """Returns the number of states."""
+        return len(self.transitions) - len(self.free)
+
+    def __signature(self, state: int) -> Tuple[int, FrozenSet[Tuple[str, int]]]:
+        return self.finals[state], frozenset(self.transitions[state].items())
+
+    def __new_state(self, final: int, transitions: Dict[str, int]) -> int:
+        """Adds a state and counts its transitions in the indegrees of the targets."""
+        for target in transitions.values():
+            self.indegree[target] += 1
+        if self.free:
+            state: int = self.free.pop()
+            self.transitions[state], self.finals[state], self.indegree[state] = \
+                transitions, final, 0
+            return state
+        self.transitions.append(transitions)
+        self.finals.append(final)
+        self.indegree.append(0)
+        return len(self.transitions) - 1
+
+    def __redirect(self, source: int, letter: str, target: int) -> None:
+        """Replaces the transition from {source} with {letter} with one to {target}."""
+        old: Optional[int] = self.transitions[source].get(letter)
+        if old is not None:
+            self.indegree[old] -= 1
+        self.transitions[source][letter] = target
+        self.indegree[target] += 1
+
+    def __add_suffix(self, path: List[int], suffix: str) -> None:
+        """Adds new states for {suffix} after the last state of the path."""
+        transitions: List[Dict[str, int]] = self.transitions
+        # The last state has no transition with suffix[0] yet.
+        for letter in suffix:
+            state: int = self.__new_state(0, {})
+            transitions[path[-1]][letter] = state
+            self.indegree[state] = 1
+            path.append(state)
+        self.finals[path[-1]] = 1
+
+    def __replace_or_register(self, path: List[int], word: str, start: int) -> None:
+        """Registers the states path[start:] from the last one. A state equivalent to
+        a registered one is dropped and its predecessor on the path goes to the
+        registered state instead."""
+        transitions: List[Dict[str, int]] = self.transitions
+        finals: bytearray = self.finals
+        indegree: List[int] = self.indegree
+        register: Dict[Tuple[int, FrozenSet[Tuple[str, int]]], int] = self.register
+        for index in range(len(path) - 1, start - 1, -1):
+            state: int = path[index]
+            row: Dict[str, int] = transitions[state]
+            signature: Tuple[int, FrozenSet[Tuple[str, int]]] = \
+                finals[state], frozenset(row.items())
+            equivalent: Optional[int] = register.get(signature)
+            if equivalent is None:
+                register[signature] = state
+                continue
+            # The predecessor is the only state going to {state}.
+            transitions[path[index - 1]][word[index - 1]] = equivalent
+            indegree[equivalent] += 1
+            for target in row.values():
+                indegree[target] -= 1
+            transitions[state] = {}
+            self.free.append(state)
+        del path[start:]
+
+    def add(self, word: str) -> None:
+        """Adds a word. Words which are already in the automaton are skipped."""
+        if self.sorted and word < self.previous:
+            self.__replace_or_register(self.path, self.previous, 1)
+            self.path = []
+        if self.sorted:
+            common: int = 0
+            for letter, other in zip(word, self.previous):
+                if letter != other:
+                    break
+                common += 1
+            if common == len(word) == len(self.previous) and self.finals[self.path[-1]]:
+                return
+            self.__replace_or_register(self.path, self.previous, common + 1)
+            self.__add_suffix(self.path, word[common:])
+            self.previous = word
+        else:
+            self.__add_unsorted(word)
+
+    def __add_unsorted(self, word: str) -> None:
+        path: List[int] = [ROOT]
+        for letter in word:
+            target: Optional[int] = self.transitions[path[-1]].get(letter)
+            if target is None:
+                break
+            path.append(target)
+        common: int = len(path) - 1
+        if common == len(word) and self.finals[path[-1]]:
+            return
+        # The states before the first one with more than one transition to it change
+        # in place, so they leave the register. The states from it on are cloned.
+        first: int = next((index for index in range(1, len(path))
+                           if self.indegree[path[index]] > 1), len(path))
+        for state in path[1:first]:
+            del self.register[self.__signature(state)]
+        for index in range(first, len(path)):
+            state = path[index]
+            path[index] = self.__new_state(self.finals[state], dict(self.transitions[state]))
+            self.__redirect(path[index - 1], word[index - 1], path[index])
+        self.__add_suffix(path, word[common:])
+        self.__replace_or_register(path, word, 1)
+
+    def finish(self) -> Tuple[int, List[Tuple[int, str, int]], List[int]]:
+        """Registers the remaining states and returns the number of states, the
+        transitions and the final states with the states numbered 0..n-1 in the
+        order of a depth-first search from the start (which is 0). Without words
+        there are no states at all, like in a trimmed automaton."""
+        if self.sorted:
+            self.__replace_or_register(self.path, self.previous, 1)
+            self.path = []
+        numbers: Dict[int, int] = {ROOT: 0}
+        edges: List[Tuple[int, str, int]] = []
+        stack: List[int] = [ROOT]
+        while stack:
+            state: int = stack.pop()
+            for letter, target in sorted(self.transitions[state].items(), reverse=True):
+                number: Optional[int] = numbers.get(target)
+                if number is None:
+                    number = numbers[target] = len(numbers)
+                    stack.append(target)
+                edges.append((numbers[state], letter, number))
+        finals: List[int] = [number for state, number in numbers.items() if self.finals[state]]
+        if not finals:
+            return 0, [], []
+        return len(numbers), edges, finals
+
+    def words(self) -> Iterator[str]:
+        """Yields the words added so far in lexicographic order."""
+        stack: List[Tuple[int, str]] = [(ROOT, "")]
+        while stack:
+            state, prefix = stack.pop()
+            if self.finals[state]:
+                yield prefix
+            for letter, target in sorted(self.transitions[state].items(), reverse=True):
+                stack.append((target, prefix + letter))
@@ -0,0 +1,105 @@
+"""Module for building the regex of an automaton with the state elimination algorithm."""
+
+from __future__ import annotations
+from typing import Dict, Iterable, List, Set, Tuple
+
+def _is_atom(regex: str) -> bool:
+    """Checks if regex can be starred without brackets."""
+    if len(regex) == 1:
+        return True
+    if regex[0] != "(" or regex[-1] != ")":
+        return False
+    depth: int = 0
+    for i, symbol in enumerate(regex):
+        depth += (symbol == "(") - (symbol == ")")
+        if depth == 0:
+            return i == len(regex) - 1
+    return False
+
+def _has_union(regex: str) -> bool:
+    """Checks if regex has a + outside of brackets."""
+    depth: int = 0
+    for symbol in regex:
+        depth += (symbol == "(") - (symbol == ")")
+        if symbol == "+" and depth == 0:
+            return True
+    return False
+
+def regex_union(first: str, second: str) -> str:
+    """Returns regex for the union of two regexes. The empty string stands for
+    the empty language."""
+    if not first or first == second:
+        return second
+    if not second:
+        return first
+    return f"{first}+{second}"
+
+def regex_concat(first: str, second: str) -> str:
+    """Returns regex for the concatenation of two regexes."""
+    if not first or not second:
+        return ""
+    if first == "$":
+        return second
+    if second == "$":
+        return first
+    first = f"({first})" if _has_union(first) else first
+    second = f"({second})" if _has_union(second) else second
+    return first + second
+
+def regex_star(regex: str) -> str:
+    """Returns regex for the Kleene star of a regex."""
+    if not regex or regex == "$":
+        return "$"
+    if regex.endswith("*") and _is_atom(regex[:-1]):
+        return regex
+    return f"{regex}*" if _is_atom(regex) else f"({regex})*"
+
+class StateElimination:
+    """Graph of states 0..size-1 whose edges are labelled with regexes.
+    outgoing[p][q] and incoming[q][p] both hold the regex on the edge p -> q."""
+
+    def __init__(self, size: int) -> None:
+        self.outgoing: List[Dict[int, str]] = [{} for _ in range(size)]
+        self.incoming: List[Dict[int, str]] = [{} for _ in range(size)]
+
+    def add_edge(self, source: int, target: int, regex: str) -> None:
+        """Adds {regex} to the edge source -> target."""
+        regex = regex_union(self.outgoing[source].get(target, ""), regex)
+        self.outgoing[source][target] = self.incoming[target][source] = regex
+
+    def weight(self, state: int) -> Tuple[int, int]:
+        """Estimates how much longer the regexes get when {state} is eliminated:
+        every incoming regex is copied once per outgoing edge and vice versa."""
+        outgoing: Dict[int, str] = self.outgoing[state]
+        incoming: Dict[int, str] = self.incoming[state]
+        loop: int = len(outgoing.get(state, ""))
+        in_degree: int = len(incoming) - (state in incoming)
+        out_degree: int = len(outgoing) - (state in outgoing)
+        in_length: int = sum(len(regex) for source, regex in incoming.items() if source != state)
+        out_length: int = sum(len(regex) for target, regex in outgoing.items() if target != state)
+        return (in_length * (out_degree - 1) + out_length * (in_degree - 1)
+                + loop * (in_degree * out_degree - 1), state)
+
+    def eliminate(self, state: int) -> None:
+        """Removes {state} and replaces every path source -> state -> target
+        with an edge source -> target."""
+        loop: str = regex_star(self.outgoing[state].pop(state, ""))
+        self.incoming[state].pop(state, None)
+        for source in self.incoming[state]:
+            del self.outgoing[source][state]
+        for target in self.outgoing[state]:
+            del self.incoming[target][state]
+        for source, regex_in in self.incoming[state].items():
+            for target, regex_out in self.outgoing[state].items():
+                self.add_edge(source, target,
+                              regex_concat(regex_concat(regex_in, loop), regex_out))
+
+    def regex(self, states: Iterable[int], start: int, final: int) -> str:
+        """Eliminates {states}, the lightest one at every step, and returns the
+        regex on the edge start -> final."""
+        remaining: Set[int] = set(states)
+        while remaining:
+            eliminated: int = min(remaining, key=self.weight)
+            remaining.remove(eliminated)
+            self.eliminate(eliminated)
+        return self.outgoing[start].get(final, "")
@@ -0,0 +1,89 @@
+"""Module providing an immutable, array-backed deterministic automaton."""
+
+from __future__ import annotations
+from array import array
+from typing import Dict, Iterable, Iterator, List, Tuple
+
+DEAD_STATE: int = -1
+
+class FrozenDFA:
+    """Immutable compiled version of a deterministic automaton. States are the
+    integers 0..n-1 and letters are indexes in the sorted alphabet. The target of state q
+    with letter number c is table[q * len(alphabet) + c] (DEAD_STATE if there is none)."""
+    __slots__ = ("alphabet", "letters", "table", "start", "finals", "labels")
+    alphabet: Tuple[str, ...]
+    letters: Dict[str, int]
+    table: array
+    start: int
+    finals: bytes
+    labels: Tuple[str, ...]
+
+    def __init__(self, alphabet: Tuple[str, ...], table: array, start: int,
+                 finals: bytes, labels: Tuple[str, ...]) -> None:
+        letters: Dict[str, int] = {letter: code for code, letter in enumerate(alphabet)}
+        for name, value in (("alphabet", alphabet), ("letters", letters), ("table", table),
+                            ("start", start), ("finals", finals), ("labels", labels)):
+            object.__setattr__(self, name, value)
+
+    def __setattr__(self, name: str, value) -> None:
+        raise AttributeError("FrozenDFA is immutable.")
+
+    def __len__(self) -> int:
+        return len(self.labels)
+
+    def step(self, state: int, letter: str) -> int:
+        """Returns the state reached from {state} with {letter}."""
+        code: int = self.letters.get(letter, -1)
+        if state == DEAD_STATE or code < 0:
+            return DEAD_STATE
+        return self.table[state * len(self.alphabet) + code]
+
+    def is_final(self, state: int) -> bool:
+        """Checks if state is final."""
+        return state != DEAD_STATE and self.finals[state] == 1
+
+    def edges(self) -> Iterator[Tuple[int, str, int]]:
+        """Yields the transitions as triples (source, letter, target)."""
+        width: int = len(self.alphabet)
+        for index, target in enumerate(self.table):
+            if target != DEAD_STATE:
+                yield index // width, self.alphabet[index % width], target
+
+    def matches(self, word: str) -> bool:
+        """Checks if word is in the automaton language."""
+        letters: Dict[str, int] = self.letters
+        table: array = self.table
+        width: int = len(self.alphabet)
+        state: int = self.start
+        if state == DEAD_STATE:
+            return False
+        for letter in word:
+            code: int = letters.get(letter, -1)
+            if code < 0:
+                return False
+            state = table[state * width + code]
+            if state < 0:
+                return False
+        return self.finals[state] == 1
+
+    def matches_many(self, words: Iterable[str]) -> List[bool]:
+        """Checks many words at once. The loop of FrozenDFA.matches is inlined.
+        Nothing is kept between the words, so the memory does not grow with them."""
+        letters: Dict[str, int] = self.letters
+        table: array = self.table
+        width: int = len(self.alphabet)
+        finals: bytes = self.finals
+        result: List[bool] = []
+        for word in words:
+            state: int = self.start
+            for letter in word:
+                code: int = letters.get(letter, -1)
+                if code < 0 or state < 0:
+                    state = DEAD_STATE
+                    break
+                state = table[state * width + code]
+            result.append(state >= 0 and finals[state] == 1)
+        return result
+
+    def __repr__(self) -> str:
+        return f"--- FrozenDFA: {len(self.labels)} states, alphabet {list(self.alphabet)}"
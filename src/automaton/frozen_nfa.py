@@ -0,0 +1,86 @@
+"""Module providing an immutable, compact (not necessarily deterministic) automaton."""
+
+from __future__ import annotations
+import sys
+from array import array
+from typing import Dict, Iterable, Iterator, List, Set, Tuple
+
+class FrozenNFA:
+    """Immutable compact version of an automaton. States are the integers 0..n-1 and
+    letters are indexes in the sorted alphabet. The transitions are stored in compressed
+    sparse rows: the targets of state q with letter number c are
+    targets[offsets[r]:offsets[r + 1]] where r = q * len(alphabet) + c. Every transition
+    takes 4 bytes in {targets} and every pair of a state and a letter 4 bytes in {offsets}.
+    The constructor gets both arrays as the pair {rows} = (offsets, targets)."""
+    __slots__ = ("alphabet", "letters", "offsets", "targets", "starts", "finals", "labels")
+    alphabet: Tuple[str, ...]
+    letters: Dict[str, int]
+    offsets: array
+    targets: array
+    starts: array
+    finals: bytes
+    labels: Tuple[str, ...]
+
+    def __init__(self, alphabet: Tuple[str, ...], rows: Tuple[array, array],
+                 starts: array, finals: bytes, labels: Tuple[str, ...]) -> None:
+        letters: Dict[str, int] = {letter: code for code, letter in enumerate(alphabet)}
+        offsets, targets = rows
+        labels = tuple(sys.intern(label) for label in labels)
+        for name, value in (("alphabet", alphabet), ("letters", letters),
+                            ("offsets", offsets), ("targets", targets), ("starts", starts),
+                            ("finals", finals), ("labels", labels)):
+            object.__setattr__(self, name, value)
+
+    def __setattr__(self, name: str, value) -> None:
+        raise AttributeError("FrozenNFA is immutable.")
+
+    def __len__(self) -> int:
+        return len(self.labels)
+
+    def transition_count(self) -> int:
+        """Returns the number of transitions."""
+        return len(self.targets)
+
+    def successors(self, state: int, letter: str) -> array:
+        """Returns the states reached from {state} with {letter}."""
+        code: int = self.letters.get(letter, -1)
+        if code < 0:
+            return array("i")
+        row: int = state * len(self.alphabet) + code
+        return self.targets[self.offsets[row]:self.offsets[row + 1]]
+
+    def edges(self) -> Iterator[Tuple[int, str, int]]:
+        """Yields the transitions as triples (source, letter, target)."""
+        width: int = len(self.alphabet)
+        for row in range(len(self.offsets) - 1):
+            for index in range(self.offsets[row], self.offsets[row + 1]):
+                yield row // width, self.alphabet[row % width], self.targets[index]
+
+    def matches(self, word: str) -> bool:
+        """Checks if word is in the automaton language. The sets of states reached
+        by the prefixes of the word are computed one by one."""
+        letters: Dict[str, int] = self.letters
+        offsets: array = self.offsets
+        targets: array = self.targets
+        width: int = len(self.alphabet)
+        states: Set[int] = set(self.starts)
+        for letter in word:
+            code: int = letters.get(letter, -1)
+            if code < 0:
+                return False
+            reached: Set[int] = set()
+            for state in states:
+                row: int = state * width + code
+                reached.update(targets[offsets[row]:offsets[row + 1]])
+            if not reached:
+                return False
+            states = reached
+        return any(self.finals[state] == 1 for state in states)
+
+    def matches_many(self, words: Iterable[str]) -> List[bool]:
+        """Checks many words at once."""
+        return [self.matches(word) for word in words]
+
+    def __repr__(self) -> str:
+        return f"--- FrozenNFA: {len(self.labels)} states, {len(self.targets)} transitions," \
+            f" alphabet {list(self.alphabet)}"
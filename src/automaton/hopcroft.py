@@ -0,0 +1,102 @@
+"""Module with Hopcroft's partition refinement for minimizing deterministic automatons.
+The automatons are total transition tables: table[q][c] is the state reached from q
+with the letter number c."""
+
+from __future__ import annotations
+from collections import deque
+from typing import Deque, Dict, List, Set, Tuple
+
+def _inverse(table: List[List[int]], letters: int) -> List[List[List[int]]]:
+    """Returns the inverse table: inverse[c][q] holds the states going to q with
+    the letter number c."""
+    inverse: List[List[List[int]]] = [[[] for _ in table] for _ in range(letters)]
+    for state, row in enumerate(table):
+        for code, target in enumerate(row):
+            inverse[code][target].append(state)
+    return inverse
+
+def _alive(inverse: List[List[List[int]]], finals: List[bool]) -> List[bool]:
+    """Returns flags for the states from which a final state is reachable."""
+    alive: List[bool] = list(finals)
+    stack: List[int] = [state for state, final in enumerate(finals) if final]
+    while stack:
+        state: int = stack.pop()
+        for sources in inverse:
+            for source in sources[state]:
+                if not alive[source]:
+                    alive[source] = True
+                    stack.append(source)
+    return alive
+
+class _Partition:
+    """Partition of the states into blocks. block_of[q] is the index of the block of q
+    and {waiting} holds the pairs (block, letter number) still to be used as splitters.
+    At the beginning the blocks are the finals, the alive non-finals and the dead states
+    and all of them but the largest one are splitters."""
+
+    def __init__(self, finals: List[bool], alive: List[bool], letters: int) -> None:
+        states: range = range(len(finals))
+        self.blocks: List[Set[int]] = [block for block in (
+            {state for state in states if finals[state]},
+            {state for state in states if alive[state] and not finals[state]},
+            {state for state in states if not alive[state]}) if block]
+        self.block_of: List[int] = [0] * len(finals)
+        for index, block in enumerate(self.blocks):
+            for state in block:
+                self.block_of[state] = index
+        largest: int = max(range(len(self.blocks)), key=lambda index: len(self.blocks[index]))
+        self.waiting: Set[Tuple[int, int]] = {(index, code) for index in range(len(self.blocks))
+                                              for code in range(letters) if index != largest}
+        self.letters = letters
+
+    def split(self, index: int, moved: List[int]) -> None:
+        """Moves the states {moved} out of block {index} into a new block. For every
+        letter the smaller of the two blocks becomes a splitter, unless the old
+        block is already waiting."""
+        new_index: int = len(self.blocks)
+        self.blocks.append(set(moved))
+        self.blocks[index].difference_update(moved)
+        for state in moved:
+            self.block_of[state] = new_index
+        for code in range(self.letters):
+            if (index, code) in self.waiting\
+                or len(self.blocks[new_index]) <= len(self.blocks[index]):
+                self.waiting.add((new_index, code))
+            else:
+                self.waiting.add((index, code))
+
+    def refine(self, inverse: List[List[List[int]]]) -> None:
+        """Splits the blocks until none of them is split by a splitter."""
+        while self.waiting:
+            splitter, code = self.waiting.pop()
+            touched: Dict[int, List[int]] = {}
+            for state in self.blocks[splitter]:
+                for source in inverse[code][state]:
+                    touched.setdefault(self.block_of[source], []).append(source)
+            for index, moved in touched.items():
+                if len(moved) != len(self.blocks[index]):
+                    self.split(index, moved)
+
+def minimal_table(table: List[List[int]], finals: List[bool])\
+    -> Tuple[List[List[int]], List[bool]]:
+    """Returns the transition table and the finals of the minimal automaton for the
+    language of state 0. Its states are the blocks reachable from the block of state 0,
+    numbered in BFS order. The refinement runs in O(n.k.log(n)) time."""
+    letters: int = len(table[0]) if table else 0
+    inverse: List[List[List[int]]] = _inverse(table, letters)
+    partition: _Partition = _Partition(finals, _alive(inverse, finals), letters)
+    partition.refine(inverse)
+
+    # Every block is represented by the first of its states found by the BFS.
+    block_of: List[int] = partition.block_of
+    numbers: Dict[int, int] = {block_of[0]: 0}
+    representatives: List[int] = [0]
+    queue: Deque[int] = deque(representatives)
+    while queue:
+        for target in table[queue.popleft()]:
+            if block_of[target] not in numbers:
+                numbers[block_of[target]] = len(representatives)
+                representatives.append(target)
+                queue.append(target)
+    return ([[numbers[block_of[target]] for target in table[state]] for state in representatives],
+            [finals[state] for state in representatives])
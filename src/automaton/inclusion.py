@@ -0,0 +1,151 @@
+"""Module for comparing the languages of automatons without building their products.
+The automatons are determinized lazily: only the subsets of states reached by the
+searches are computed (see SubsetView)."""
+
+from __future__ import annotations
+from collections import deque
+from itertools import chain
+from typing import Deque, Dict, FrozenSet, List, Optional, Sequence, Set, Tuple
+
+class SubsetView:
+    """The determinized version of an automaton without building it. The states are
+    the integers 0..n-1, subsets of states are frozensets of them and letters are
+    indexes in a sorted alphabet. successors[q][c] holds the states reached from q
+    with letter number c."""
+    __slots__ = ("start", "successors", "finals")
+
+    def __init__(self, start: FrozenSet[int], successors: List[List[Tuple[int, ...]]],
+                 finals: Set[int]) -> None:
+        self.start = start
+        self.successors = successors
+        self.finals = finals
+
+    def step(self, subset: FrozenSet[int], code: int) -> FrozenSet[int]:
+        """Returns the subset reached from {subset} with letter number {code}."""
+        successors: List[List[Tuple[int, ...]]] = self.successors
+        return frozenset(chain.from_iterable(successors[state][code] for state in subset))
+
+    def accepts(self, subset: FrozenSet[int]) -> bool:
+        """Checks if {subset} has a final state."""
+        return not self.finals.isdisjoint(subset)
+
+def restore_word(pairs: Sequence[Tuple[object, object, int, int]],
+                 index: int, alphabet: List[str]) -> str:
+    """Returns the word leading to pairs[index]. Every pair holds the index of
+    the pair it was reached from (-1 for the starting ones) and the code of the letter."""
+    word: List[str] = []
+    while pairs[index][2] >= 0:
+        word.append(alphabet[pairs[index][3]])
+        index = pairs[index][2]
+    return "".join(reversed(word))
+
+def distinguishing_word(first: SubsetView, second: SubsetView,
+                        alphabet: List[str]) -> Optional[str]:
+    """Returns a shortest word which is accepted by exactly one of the views, or None
+    if there is no such word. The algorithm is Hopcroft and Karp's: pairs of subsets are
+    explored in BFS order and merged with union-find, so a pair is skipped if its
+    equivalence follows from the already visited ones."""
+    # The union-find elements are (0, subset of first) and (1, subset of second).
+    parents: Dict[Tuple[int, FrozenSet[int]], Tuple[int, FrozenSet[int]]] = {}
+
+    def find(element: Tuple[int, FrozenSet[int]]) -> Tuple[int, FrozenSet[int]]:
+        parents.setdefault(element, element)
+        while parents[element] != element:
+            parents[element] = parents[parents[element]]
+            element = parents[element]
+        return element
+
+    # Every visited pair keeps the index of its parent pair and the letter code,
+    # so the word leading to it can be restored.
+    pairs: List[Tuple[FrozenSet[int], FrozenSet[int], int, int]] =\
+        [(first.start, second.start, -1, -1)]
+    parents[find((0, first.start))] = find((1, second.start))
+    for index, (subset_1, subset_2, _, _) in enumerate(pairs):
+        if first.accepts(subset_1) != second.accepts(subset_2):
+            return restore_word(pairs, index, alphabet)
+        for code in range(len(alphabet)):
+            target_1: FrozenSet[int] = first.step(subset_1, code)
+            target_2: FrozenSet[int] = second.step(subset_2, code)
+            root_1 = find((0, target_1))
+            root_2 = find((1, target_2))
+            if root_1 != root_2:
+                parents[root_1] = root_2
+                pairs.append((target_1, target_2, index, code))
+    return None
+
+def missing_word(first: SubsetView, second: SubsetView, alphabet: List[str]) -> Optional[str]:
+    """Returns a shortest word accepted by {second} and not by {first}, or None if there
+    is no such word. The pairs of subsets are explored in BFS order and the search stops
+    at the first counterexample."""
+    start: Tuple[FrozenSet[int], FrozenSet[int]] = (first.start, second.start)
+    visited: Set[Tuple[FrozenSet[int], FrozenSet[int]]] = {start}
+    pairs: List[Tuple[FrozenSet[int], FrozenSet[int], int, int]] =\
+        [(first.start, second.start, -1, -1)]
+    for index, (subset_1, subset_2, _, _) in enumerate(pairs):
+        if not first.accepts(subset_1) and second.accepts(subset_2):
+            return restore_word(pairs, index, alphabet)
+        if not subset_2:
+            continue
+        for code in range(len(alphabet)):
+            target: Tuple[FrozenSet[int], FrozenSet[int]] =\
+                (first.step(subset_1, code), second.step(subset_2, code))
+            if target not in visited:
+                visited.add(target)
+                pairs.append((target[0], target[1], index, code))
+    return None
+
+def antichain_missing_word(first: SubsetView, second: SubsetView,
+                           alphabet: List[str]) -> Optional[str]:
+    """Antichain version of missing_word for a non-deterministic {first}. The explored
+    pairs are (state of second, subset of states of first). If S is a subset of S',
+    every word rejected from S' is rejected from S too, so (p, S') is skipped when
+    (p, S) is already explored. Only the minimal subsets for every state p are kept
+    (an antichain)."""
+    antichains: Dict[int, Set[FrozenSet[int]]] = {}
+
+    def subsumed(state: int, subset: FrozenSet[int]) -> bool:
+        antichain: Set[FrozenSet[int]] = antichains.setdefault(state, set())
+        if any(explored <= subset for explored in antichain):
+            return True
+        antichain.difference_update([explored for explored in antichain if subset < explored])
+        antichain.add(subset)
+        return False
+
+    pairs: List[Tuple[int, FrozenSet[int], int, int]] = []
+    for state in sorted(second.start):
+        if not subsumed(state, first.start):
+            pairs.append((state, first.start, -1, -1))
+    # Pairs removed from the antichains are still expanded: they may be closer to
+    # the start than the pairs which replaced them, and the word must be shortest.
+    for index, (state, subset, _, _) in enumerate(pairs):
+        if state in second.finals and not first.accepts(subset):
+            return restore_word(pairs, index, alphabet)
+        for code in range(len(alphabet)):
+            target_subset: FrozenSet[int] = first.step(subset, code)
+            for target in second.successors[state][code]:
+                if not subsumed(target, target_subset):
+                    pairs.append((target, target_subset, index, code))
+    return None
+
+def is_universal(view: SubsetView, letters: int) -> bool:
+    """Checks if every word over {letters} letters is accepted by the view. The subsets
+    are explored lazily in BFS order. If S is a subset of S', every word rejected from
+    S' is rejected from S too, so S' is skipped when S is already explored and only the
+    minimal explored subsets are kept (an antichain)."""
+    antichain: Set[FrozenSet[int]] = {view.start}
+    subsets: Deque[FrozenSet[int]] = deque([view.start])
+    while subsets:
+        subset: FrozenSet[int] = subsets.popleft()
+        if subset not in antichain:
+            continue
+        if not view.accepts(subset):
+            return False
+        for code in range(letters):
+            target: FrozenSet[int] = view.step(subset, code)
+            if any(explored <= target for explored in antichain):
+                continue
+            antichain.difference_update([explored for explored in antichain
+                                         if target < explored])
+            antichain.add(target)
+            subsets.append(target)
+    return True
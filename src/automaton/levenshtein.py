@@ -0,0 +1,169 @@
+"""Module for finding the words of a regular language close to a given word."""
+
+from __future__ import annotations
+import sys
+from collections import deque
+from typing import Callable, Deque, Dict, List, Optional, Tuple
+from src.automaton.frozen_nfa import FrozenNFA
+
+# The letter of a deletion in the parents of LevenshteinMatcher.closest.
+NO_LETTER: str = ""
+# The length of the longest word from a state which is on a cycle.
+UNBOUNDED: int = sys.maxsize
+
+class LevenshteinMatcher:
+    """Finds the words of the language of a frozen automaton with the smallest edit
+    distance (insertions, deletions and substitutions of letters) to a given word.
+    It is a lazy product of the Levenshtein automaton of the word with the frozen
+    automaton: a node (i, q) means that the first i letters of the word were read and
+    the automaton is in state q, and the number of errors is the distance of the node
+    in a graph whose edges cost 0 (a matching letter) or 1 (an edit).
+
+    The nodes are visited with A*: shortest[q] and longest[q] are the lengths of the
+    shortest and the longest words leading from q to a final state, so at least
+    shortest[q] - r insertions or r - longest[q] deletions are needed when r letters of
+    the word are left. States from which no final state can be reached are never
+    visited and nodes which need more than {max_distance} edits are never built."""
+
+    def __init__(self, frozen: FrozenNFA) -> None:
+        self.frozen = frozen
+        width: int = len(frozen.alphabet)
+        predecessors: List[List[int]] = [[] for _ in range(len(frozen))]
+        for source, _, target in frozen.edges():
+            predecessors[target].append(source)
+        self.shortest: List[int] = self.__shortest(predecessors)
+        # moves[q] holds the pairs (letter number, target) of the transitions from q
+        # to states from which a final state can be reached.
+        self.moves: List[List[Tuple[int, int]]] = [
+            [(code, target) for code in range(width)
+             for target in frozen.targets[frozen.offsets[state * width + code]:
+                                          frozen.offsets[state * width + code + 1]]
+             if self.shortest[target] != UNBOUNDED]
+            for state in range(len(frozen))]
+        self.longest: List[int] = self.__longest(predecessors)
+
+    def __shortest(self, predecessors: List[List[int]]) -> List[int]:
+        """Returns the lengths of the shortest words from every state to a final state
+        (UNBOUNDED if there is none) with a breadth-first search from the finals."""
+        shortest: List[int] = [0 if final else UNBOUNDED for final in self.frozen.finals]
+        queue: Deque[int] = deque(state for state, length in enumerate(shortest)
+                                  if length == 0)
+        while queue:
+            state: int = queue.popleft()
+            for source in predecessors[state]:
+                if shortest[source] == UNBOUNDED:
+                    shortest[source] = shortest[state] + 1
+                    queue.append(source)
+        return shortest
+
+    def __longest(self, predecessors: List[List[int]]) -> List[int]:
+        """Returns the lengths of the longest words from every state to a final state.
+        The states are removed from the sinks like in a topological sort; the states
+        which are never removed lead to a cycle, so their words are UNBOUNDED."""
+        longest: List[int] = [UNBOUNDED] * len(self.frozen)
+        remaining: List[int] = [len(moves) for moves in self.moves]
+        stack: List[int] = [state for state, count in enumerate(remaining)
+                            if count == 0 and self.shortest[state] != UNBOUNDED]
+        for state in stack:
+            longest[state] = 0
+        while stack:
+            state = stack.pop()
+            for source in predecessors[state]:
+                remaining[source] -= 1
+                if remaining[source] == 0:
+                    longest[source] = max(longest[target] for _, target in self.moves[source])
+                    longest[source] += 1
+                    stack.append(source)
+        return longest
+
+    def closest(self, word: str, max_distance: Optional[int] = None)\
+            -> Optional[Tuple[int, str]]:
+        """Returns the smallest edit distance between {word} and a word of the language
+        together with such a word, or None if the language has no word within
+        {max_distance} edits (or is empty)."""
+        search: _Search = _Search(self, word, UNBOUNDED if max_distance is None
+                                  else max_distance)
+        for start in self.frozen.starts:
+            if self.shortest[start] != UNBOUNDED:
+                search.relax(0, start, 0, -1, NO_LETTER)
+        bound: int = 0
+        while bound < len(search.buckets):
+            bucket: List[int] = search.buckets[bound]
+            while bucket:
+                node: int = bucket.pop()
+                position, state = divmod(node, len(self.frozen))
+                if search.estimate(position, state, search.distances[node]) != bound:
+                    continue
+                if position == len(word) and self.frozen.finals[state]:
+                    return search.distances[node], search.witness(node)
+                search.expand(position, state)
+            bound += 1
+        return None
+
+    def distance(self, word: str, max_distance: Optional[int] = None) -> Optional[int]:
+        """Returns the smallest edit distance between {word} and a word of the language
+        or None if there is none within {max_distance} edits."""
+        found: Optional[Tuple[int, str]] = self.closest(word, max_distance)
+        return None if found is None else found[0]
+
+    def matches(self, word: str, max_distance: int) -> bool:
+        """Checks if a word of the language is within {max_distance} edits of {word}."""
+        return self.closest(word, max_distance) is not None
+
+class _Search:
+    """One search of LevenshteinMatcher.closest. The node (i, q) is the integer
+    i * size + q. buckets[f] holds the nodes whose number of edits plus the lower
+    bound for the rest is f."""
+
+    def __init__(self, matcher: LevenshteinMatcher, word: str, limit: int) -> None:
+        self.matcher = matcher
+        self.codes: List[int] = [matcher.frozen.letters.get(letter, -1) for letter in word]
+        self.limit = limit
+        self.distances: Dict[int, int] = {}
+        self.parents: Dict[int, Tuple[int, str]] = {}
+        self.buckets: List[List[int]] = []
+
+    def estimate(self, position: int, state: int, distance: int) -> int:
+        """Returns {distance} plus the lower bound for the edits after the node."""
+        left: int = len(self.codes) - position
+        return distance + max(self.matcher.shortest[state] - left,
+                              left - self.matcher.longest[state], 0)
+
+    def relax(self, position: int, state: int, distance: int, parent: int,
+              letter: str) -> None:
+        """Reaches the node (position, state) from {parent} reading {letter}."""
+        matcher: LevenshteinMatcher = self.matcher
+        left: int = len(self.codes) - position
+        bound: int = distance + max(matcher.shortest[state] - left,
+                                    left - matcher.longest[state], 0)
+        node: int = position * len(matcher.frozen) + state
+        if bound <= self.limit and distance < self.distances.get(node, UNBOUNDED):
+            self.distances[node] = distance
+            self.parents[node] = (parent, letter)
+            while len(self.buckets) <= bound:
+                self.buckets.append([])
+            self.buckets[bound].append(node)
+
+    def expand(self, position: int, state: int) -> None:
+        """Relaxes the edges of the node (position, state): a deletion, an insertion
+        or a substitution costs 1 and a matching letter 0."""
+        node: int = position * len(self.matcher.frozen) + state
+        distance: int = self.distances[node]
+        alphabet: Tuple[str, ...] = self.matcher.frozen.alphabet
+        relax: Callable[[int, int, int, int, str], None] = self.relax
+        # The code of the next letter of the word or None at its end.
+        code: Optional[int] = self.codes[position] if position < len(self.codes) else None
+        if code is not None:
+            relax(position + 1, state, distance + 1, node, NO_LETTER)
+        for other, target in self.matcher.moves[state]:
+            relax(position, target, distance + 1, node, alphabet[other])
+            if code is not None:
+                relax(position + 1, target, distance + (other != code), node, alphabet[other])
+
+    def witness(self, node: int) -> str:
+        """Returns the letters read by the automaton on the way to {node}."""
+        letters: List[str] = []
+        while node >= 0:
+            node, letter = self.parents[node]
+            letters.append(letter)
+        return "".join(reversed(letters))
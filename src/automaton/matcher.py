@@ -0,0 +1,182 @@
+"""Module providing a matcher which reads words in chunks, e.g. from large files."""
+
+from __future__ import annotations
+import codecs
+from array import array
+from typing import BinaryIO, Dict, FrozenSet, List, Optional, Set, TextIO, Tuple, Union, cast
+from src.automaton.frozen_dfa import FrozenDFA, DEAD_STATE
+from src.automaton.frozen_nfa import FrozenNFA
+
+EMPTY_SET: FrozenSet[int] = frozenset()
+INVALID_EDIT: str = "Edited positions are not in the word."
+
+class Matcher:
+    """Checks if a word is in the language of a frozen automaton while the word is
+    read chunk by chunk. For a FrozenDFA the current state is an integer (DEAD_STATE
+    when no word with the read prefix is accepted), for a FrozenNFA it is the frozenset
+    of the reached states. The subsets reached in a FrozenNFA are cached like the states
+    of a DFA; the cache is cleared when it holds more than {max_states} transitions."""
+
+    def __init__(self, frozen: Union[FrozenDFA, FrozenNFA], max_states: int = 10000) -> None:
+        self.frozen = frozen
+        self.max_states = max_states
+        self.state: Union[int, FrozenSet[int]] = DEAD_STATE
+        self.__cache: Dict[Tuple[FrozenSet[int], int], FrozenSet[int]] = {}
+        self.reset()
+
+    def reset(self) -> None:
+        """Goes back to the start, so a new word can be read."""
+        if isinstance(self.frozen, FrozenDFA):
+            self.state = self.frozen.start
+        else:
+            self.state = frozenset(self.frozen.starts)
+
+    def is_dead(self) -> bool:
+        """Checks if no word starting with the read prefix can be accepted."""
+        return self.state in (DEAD_STATE, EMPTY_SET)
+
+    def is_accepting(self) -> bool:
+        """Checks if the read prefix is in the automaton language."""
+        if isinstance(self.frozen, FrozenDFA):
+            return self.frozen.is_final(cast(int, self.state))
+        return any(self.frozen.finals[state] == 1 for state in cast(FrozenSet[int], self.state))
+
+    def feed(self, chunk: str) -> Matcher:
+        """Reads the next part of the word. Returns self, so calls can be chained."""
+        if isinstance(self.frozen, FrozenDFA):
+            self.__feed_dfa(self.frozen, chunk)
+        else:
+            self.__feed_nfa(self.frozen, chunk)
+        return self
+
+    def __feed_dfa(self, frozen: FrozenDFA, chunk: str) -> None:
+        """The loop of FrozenDFA.matches which starts from the current state."""
+        letters: Dict[str, int] = frozen.letters
+        table: array = frozen.table
+        width: int = len(frozen.alphabet)
+        state: int = cast(int, self.state)
+        if state == DEAD_STATE:
+            return
+        for letter in chunk:
+            code: int = letters.get(letter, -1)
+            if code < 0:
+                state = DEAD_STATE
+                break
+            state = table[state * width + code]
+            if state < 0:
+                break
+        self.state = state
+
+    def __feed_nfa(self, frozen: FrozenNFA, chunk: str) -> None:
+        """Reads the chunk with the sets of reached states."""
+        letters: Dict[str, int] = frozen.letters
+        offsets: array = frozen.offsets
+        targets: array = frozen.targets
+        width: int = len(frozen.alphabet)
+        cache: Dict[Tuple[FrozenSet[int], int], FrozenSet[int]] = self.__cache
+        states: FrozenSet[int] = cast(FrozenSet[int], self.state)
+        for letter in chunk:
+            if not states:
+                break
+            code: int = letters.get(letter, -1)
+            if code < 0:
+                states = EMPTY_SET
+                break
+            reached: Optional[FrozenSet[int]] = cache.get((states, code))
+            if reached is None:
+                found: Set[int] = set()
+                for state in states:
+                    row: int = state * width + code
+                    found.update(targets[offsets[row]:offsets[row + 1]])
+                if len(cache) >= self.max_states:
+                    cache.clear()
+                reached = cache[(states, code)] = frozenset(found)
+            states = reached
+        self.state = states
+
+    def feed_file(self, file: Union[TextIO, BinaryIO], buffer_size: int = 1 << 16,
+                  encoding: str = "utf-8") -> Matcher:
+        """Reads the rest of a file object (or a memory-mapped file) {buffer_size} symbols
+        or bytes at a time. Bytes are decoded incrementally with {encoding}, so letters
+        split between two buffers are read correctly. Reading stops early when the
+        matcher is dead. Returns self."""
+        decoder = codecs.getincrementaldecoder(encoding)()
+        while not self.is_dead():
+            chunk: Union[str, bytes] = file.read(buffer_size)
+            if not chunk:
+                break
+            self.feed(decoder.decode(chunk) if isinstance(chunk, bytes) else chunk)
+        if not self.is_dead():
+            self.feed(decoder.decode(b"", final=True))
+        return self
+
+class IncrementalMatcher:
+    """Checks if a word is in the language of a frozen automaton while the word is edited.
+    checkpoints[k] is the state of a Matcher after the first k * {interval} letters, so
+    after an edit at position i only the letters from the last checkpoint before i are
+    read again. Appending reads only the new letters. When there are more than
+    {max_checkpoints} checkpoints, every second one is dropped and the interval doubles,
+    so long words need bounded memory."""
+
+    def __init__(self, frozen: Union[FrozenDFA, FrozenNFA], max_checkpoints: int = 4096) -> None:
+        self.matcher = Matcher(frozen)
+        self.max_checkpoints = max_checkpoints
+        self.interval: int = 1
+        self.letters: List[str] = []
+        self.checkpoints: List[Union[int, FrozenSet[int]]] = [self.matcher.state]
+
+    def __len__(self) -> int:
+        return len(self.letters)
+
+    @property
+    def word(self) -> str:
+        """The current word."""
+        return "".join(self.letters)
+
+    @property
+    def state(self) -> Union[int, FrozenSet[int]]:
+        """The state after the whole word (see Matcher.state)."""
+        return self.matcher.state
+
+    def is_accepting(self) -> bool:
+        """Checks if the current word is in the automaton language."""
+        return self.matcher.is_accepting()
+
+    def append(self, text: str) -> IncrementalMatcher:
+        """Appends text to the word. Returns self."""
+        position: int = len(self.letters)
+        self.letters.extend(text)
+        self.__run(position)
+        return self
+
+    def replace(self, start: int, end: int, text: str) -> IncrementalMatcher:
+        """Replaces the letters from position {start} to {end} with {text}. Returns self."""
+        if not 0 <= start <= end <= len(self.letters):
+            raise ValueError(INVALID_EDIT)
+        self.letters[start:end] = text
+        del self.checkpoints[start // self.interval + 1:]
+        self.matcher.state = self.checkpoints[-1]
+        self.__run(start // self.interval * self.interval)
+        return self
+
+    def insert(self, position: int, text: str) -> IncrementalMatcher:
+        """Inserts text at {position}. Returns self."""
+        return self.replace(position, position, text)
+
+    def delete(self, start: int, end: int) -> IncrementalMatcher:
+        """Deletes the letters from position {start} to {end}. Returns self."""
+        return self.replace(start, end, "")
+
+    def __run(self, position: int) -> None:
+        """Reads the letters from {position} on, starting from the current state of the
+        matcher, and adds a checkpoint at every multiple of the interval."""
+        while position < len(self.letters):
+            boundary: int = len(self.checkpoints) * self.interval
+            end: int = min(boundary, len(self.letters))
+            self.matcher.feed("".join(self.letters[position:end]))
+            position = end
+            if position == boundary:
+                self.checkpoints.append(self.matcher.state)
+                if len(self.checkpoints) > self.max_checkpoints:
+                    del self.checkpoints[1::2]
+                    self.interval *= 2
@@ -0,0 +1,183 @@
+"""Module for checking a word against many automatons at once."""
+
+from __future__ import annotations
+from itertools import chain
+from typing import Dict, FrozenSet, List, Optional, Sequence, Set, Tuple
+from src.automaton.frozen_nfa import FrozenNFA
+
+class _CombinedNFA:
+    """The states of the frozen automatons numbered one after another, so together they
+    are one non-deterministic automaton (see MultiMatcher). {start} holds the starting
+    subset after the restarts and the bits of the restarted automatons."""
+
+    def __init__(self, frozens: Sequence[FrozenNFA]) -> None:
+        alphabet: List[str] = sorted(set(chain.from_iterable(frozen.alphabet
+                                                             for frozen in frozens)))
+        self.letters: Dict[str, int] = {letter: code for code, letter in enumerate(alphabet)}
+
+        # successors[p][c] holds the numbers of the states reached from p with letter c.
+        self.successors: List[List[Tuple[int, ...]]] = []
+        # owners[p] is the bit of the automaton of state p, accepting[p] is the same
+        # bit for final states and 0 for the others.
+        self.owners: List[int] = []
+        self.accepting: List[int] = []
+        # starts[i] holds the numbers of the starting states of automaton number i.
+        self.starts: List[Tuple[int, ...]] = []
+        for index, frozen in enumerate(frozens):
+            base: int = len(self.successors)
+            self.starts.append(tuple(base + start for start in frozen.starts))
+            for state in range(len(frozen)):
+                row: List[Tuple[int, ...]] = []
+                for letter in alphabet:
+                    row.append(tuple(base + target
+                                     for target in frozen.successors(state, letter)))
+                self.successors.append(row)
+                self.owners.append(1 << index)
+                self.accepting.append(1 << index if frozen.finals[state] else 0)
+        self.universal: List[bool] = self.__universal_states(len(alphabet))
+        self.start: Tuple[FrozenSet[int], int] =\
+            self.restart(set(chain.from_iterable(self.starts)))
+
+    def __universal_states(self, width: int) -> List[bool]:
+        """Returns flags for the states from which every word is accepted. It is the
+        greatest set U of final states such that every state in U goes to a state in U
+        with every letter. States are dropped from U with a work list, so it takes
+        linear time."""
+        universal: List[bool] = [accepting != 0 for accepting in self.accepting]
+        # count[p][c] is the number of successors of p with letter c in U.
+        count: List[List[int]] = [[sum(universal[target] for target in targets)
+                                   for targets in row] for row in self.successors]
+        predecessors: List[List[List[int]]] = [[[] for _ in range(width)]
+                                               for _ in self.successors]
+        for source, row in enumerate(self.successors):
+            for code, targets in enumerate(row):
+                for target in targets:
+                    predecessors[target][code].append(source)
+        dropped: List[int] = [state for state, row in enumerate(count)
+                              if universal[state] and 0 in row]
+        for state in dropped:
+            universal[state] = False
+        while dropped:
+            state = dropped.pop()
+            for code, sources in enumerate(predecessors[state]):
+                for source in sources:
+                    count[source][code] -= 1
+                    if universal[source] and count[source][code] == 0:
+                        universal[source] = False
+                        dropped.append(source)
+        return universal
+
+    def restart(self, reached: Set[int]) -> Tuple[FrozenSet[int], int]:
+        """Restarts the automatons with a universal state in {reached}. Returns the
+        new subset and the bits of the restarted automatons."""
+        decided: int = 0
+        for state in reached:
+            if self.universal[state]:
+                decided |= self.accepting[state]
+        if not decided:
+            return frozenset(reached), 0
+        subset: Set[int] = {state for state in reached if not self.owners[state] & decided}
+        for index, starts in enumerate(self.starts):
+            if decided >> index & 1:
+                subset.update(starts)
+        return frozenset(subset), decided
+
+    def step(self, subset: FrozenSet[int], code: int) -> Tuple[FrozenSet[int], int]:
+        """Returns the subset reached from {subset} with letter number {code} (the empty
+        one for a negative code) after the restarts and the bits of the restarted
+        automatons."""
+        return self.restart(set() if code < 0 else set(
+            chain.from_iterable(self.successors[state][code] for state in subset)))
+
+class MultiMatcher:
+    """Finds which of many automatons accept a word with one scan of the word. The
+    frozen automatons together are one non-deterministic automaton (see _CombinedNFA).
+    Its DFA (the product of the automatons) is built lazily like in DerivativeMatcher:
+    a state is a frozenset of numbers and is built when a word reaches it. masks[q] has
+    bit i set if the automaton number i accepts in state q. When more than {max_states}
+    states are built, the cache is cleared.
+
+    When an automaton reaches a state from which every word is accepted (e.g. after w is
+    read in (a+b)*w(a+b)*), its bit is reported with the transition and the scan keeps it.
+    The states of the automaton in the subset are replaced with its starting states:
+    the bit is already known, so they only have to keep the subsets small. If the subsets
+    remembered which automatons already accept, their number would grow exponentially,
+    while after a restart (a+b)*w(a+b)* depends only on the last letters again."""
+
+    def __init__(self, frozens: Sequence[FrozenNFA], names: Sequence[str],
+                 max_states: int = 10000) -> None:
+        self.names: Tuple[str, ...] = tuple(names)
+        self.max_states = max_states
+        self.nfa: _CombinedNFA = _CombinedNFA(frozens)
+        self.numbers: Dict[FrozenSet[int], int] = {}
+        self.subsets: List[FrozenSet[int]] = []
+        self.masks: List[int] = []
+        # transitions[q][c] is the pair of the reached state and the bits of the
+        # automatons which accept every word from now on.
+        self.transitions: List[Dict[int, Tuple[int, int]]] = []
+        self.clear()
+
+    def clear(self) -> None:
+        """Drops all states but the start."""
+        self.numbers = {}
+        self.subsets = []
+        self.masks = []
+        self.transitions = []
+        self.__state(self.nfa.start[0])
+
+    def __len__(self) -> int:
+        return len(self.subsets)
+
+    def __state(self, subset: FrozenSet[int]) -> int:
+        """Returns the number of the state for {subset}, adding it if it is new."""
+        number: Optional[int] = self.numbers.get(subset)
+        if number is None:
+            number = self.numbers[subset] = len(self.subsets)
+            self.subsets.append(subset)
+            mask: int = 0
+            for state in subset:
+                mask |= self.nfa.accepting[state]
+            self.masks.append(mask)
+            self.transitions.append({})
+        return number
+
+    def step(self, state: int, letter: str) -> Tuple[int, int]:
+        """Returns the state reached from {state} with {letter} and the bits of the
+        automatons which accept every word over their alphabet from now on (a letter
+        outside of it makes every automaton reject, see match_mask). If the cache is cleared,
+        the numbers of the states change, so only the result is valid."""
+        code: int = self.nfa.letters.get(letter, -1)
+        found: Optional[Tuple[int, int]] = self.transitions[state].get(code)
+        if found is not None:
+            return found
+        source: FrozenSet[int] = self.subsets[state]
+        subset, decided = self.nfa.step(source, code)
+        if subset not in self.numbers and len(self.subsets) >= self.max_states:
+            self.clear()
+            state = self.__state(source)
+        found = self.transitions[state][code] = (self.__state(subset), decided)
+        return found
+
+    def match_mask(self, word: str) -> int:
+        """Returns a bitset whose bit i is set if automaton number i accepts the word."""
+        letters: Dict[str, int] = self.nfa.letters
+        state: int = 0
+        decided: int = self.nfa.start[1]
+        for index, letter in enumerate(word):
+            # The universal states accept every word over the alphabet of the automatons,
+            # so no automaton accepts a word with another letter.
+            if letter not in letters:
+                return 0
+            state, bits = self.step(state, letter)
+            decided |= bits
+            if not self.subsets[state]:
+                # Only the decided bits are left, unless the rest has another letter.
+                if any(other not in letters for other in word[index + 1:]):
+                    return 0
+                break
+        return decided | self.masks[state]
+
+    def matches(self, word: str) -> List[str]:
+        """Returns the names of the automatons accepting the word."""
+        mask: int = self.match_mask(word)
+        return [name for index, name in enumerate(self.names) if mask >> index & 1]
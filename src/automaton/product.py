@@ -0,0 +1,64 @@
+"""Module for building the product of two deterministic automatons."""
+
+from __future__ import annotations
+from collections import deque
+from typing import Callable, Deque, Dict, List, Optional, Tuple
+from src.automaton.frozen_dfa import DEAD_STATE
+
+class DFATable:
+    """Transitions of a deterministic automaton with states 0..n-1: table[q] maps the
+    letters to the states reached from q. {start} is DEAD_STATE if there is none."""
+    __slots__ = ("table", "finals", "start")
+
+    def __init__(self, table: List[Dict[str, int]], finals: List[bool], start: int) -> None:
+        self.table = table
+        self.finals = finals
+        self.start = start
+
+    def row(self, state: int) -> Dict[str, int]:
+        """Returns the transitions of {state} (none for the dead state)."""
+        return self.table[state] if state != DEAD_STATE else {}
+
+    def is_final(self, state: int) -> bool:
+        """Checks if state is final."""
+        return state != DEAD_STATE and self.finals[state]
+
+def _useless(accept: Callable[[bool, bool], bool], pair: Tuple[int, int]) -> bool:
+    """Checks if no final pair can be reached from {pair}: a dead component stays
+    dead and is never final."""
+    return not any(accept(final_1, final_2) for final_1 in (False, True)
+                   for final_2 in (False, True)
+                   if (pair[0] != DEAD_STATE or not final_1)
+                   and (pair[1] != DEAD_STATE or not final_2))
+
+def product_table(first: DFATable, second: DFATable, alphabet: List[str],
+                  accept: Callable[[bool, bool], bool])\
+                      -> Tuple[List[List[Tuple[str, int]]], List[bool]]:
+    """Returns the transitions and the finals of the product of two deterministic
+    automatons. The states are the ordered pairs of states reachable from the pair of
+    starting states, numbered in BFS order. A pair is final if {accept} returns True
+    for the finality of its two components. Missing transitions go to a dead component,
+    so the alphabets may differ. A pair with a dead component from which no final pair
+    can be reached, e.g. in intersections, is not added at all."""
+    start: Tuple[int, int] = (first.start, second.start)
+    numbers: Dict[Tuple[int, int], int] = {start: 0}
+    queue: Deque[Tuple[int, int]] = deque([start])
+    rows: List[List[Tuple[str, int]]] = []
+    while queue:
+        pair: Tuple[int, int] = queue.popleft()
+        transitions_1: Dict[str, int] = first.row(pair[0])
+        transitions_2: Dict[str, int] = second.row(pair[1])
+        row: List[Tuple[str, int]] = []
+        for letter in alphabet:
+            target: Tuple[int, int] = (transitions_1.get(letter, DEAD_STATE),
+                                       transitions_2.get(letter, DEAD_STATE))
+            number: Optional[int] = numbers.get(target)
+            if number is None:
+                if DEAD_STATE in target and _useless(accept, target):
+                    continue
+                number = numbers[target] = len(numbers)
+                queue.append(target)
+            row.append((letter, number))
+        rows.append(row)
+    return rows, [accept(first.is_final(state_1), second.is_final(state_2))
+                  for state_1, state_2 in numbers]
@@ -0,0 +1,84 @@
+"""Module for finding the occurrences of a regular language in a text."""
+
+from __future__ import annotations
+from array import array
+from typing import Dict, Iterator, List, Optional, Tuple
+from src.automaton.frozen_dfa import FrozenDFA
+
+# The backward automaton reads every letter outside of the alphabet as OTHER_LETTER.
+OTHER_LETTER: str = ""
+
+class Searcher:
+    """Finds the subwords of a text which are in the language L of an automaton,
+    with leftmost-longest semantics. {forward} is a DFA for L without a dead state and
+    {backward} is a DFA for Σ*L^rev whose alphabet includes OTHER_LETTER. Reading the
+    text from its end with {backward} marks all the positions where a word of L starts
+    in one pass. Then {forward} finds the longest word of L from the leftmost start."""
+    __slots__ = ("forward", "backward")
+
+    def __init__(self, forward: FrozenDFA, backward: FrozenDFA) -> None:
+        self.forward = forward
+        self.backward = backward
+
+    def starts(self, text: str) -> bytearray:
+        """Returns flags for the positions 0..len(text): flags[i] is 1 if a word
+        of the language starts at position i of the text."""
+        backward: FrozenDFA = self.backward
+        letters: Dict[str, int] = backward.letters
+        table: array = backward.table
+        finals: bytes = backward.finals
+        width: int = len(backward.alphabet)
+        other: int = letters[OTHER_LETTER]
+        state: int = backward.start
+        flags: bytearray = bytearray(len(text) + 1)
+        flags[len(text)] = finals[state]
+        for position in range(len(text) - 1, -1, -1):
+            state = table[state * width + letters.get(text[position], other)]
+            flags[position] = finals[state]
+        return flags
+
+    def longest(self, text: str, start: int) -> int:
+        """Returns the end of the longest word of the language which starts at
+        position {start} of the text or -1 if there is no such word."""
+        forward: FrozenDFA = self.forward
+        letters: Dict[str, int] = forward.letters
+        table: array = forward.table
+        finals: bytes = forward.finals
+        width: int = len(forward.alphabet)
+        state: int = forward.start
+        if state < 0:
+            return -1
+        end: int = start if finals[state] else -1
+        for position in range(start, len(text)):
+            code: int = letters.get(text[position], -1)
+            if code < 0:
+                break
+            state = table[state * width + code]
+            if state < 0:
+                break
+            if finals[state]:
+                end = position + 1
+        return end
+
+    def finditer(self, text: str) -> Iterator[Tuple[int, int]]:
+        """Yields the spans (start, end) of the non-overlapping occurrences from left
+        to right. Every occurrence is the longest one from the leftmost start after
+        the previous occurrence. After an empty occurrence the search goes on from the
+        next position."""
+        flags: bytearray = self.starts(text)
+        position: int = 0
+        while position <= len(text):
+            start: int = flags.find(1, position)
+            if start < 0:
+                return
+            end: int = self.longest(text, start)
+            yield start, end
+            position = end if end > start else start + 1
+
+    def findall(self, text: str) -> List[Tuple[int, int]]:
+        """Returns the spans of Searcher.finditer."""
+        return list(self.finditer(text))
+
+    def search(self, text: str) -> Optional[Tuple[int, int]]:
+        """Returns the span of the first occurrence or None if there is none."""
+        return next(self.finditer(text), None)
@@ -0,0 +1,134 @@
+"""Module providing the states of automatons and the storage of their transitions."""
+
+from __future__ import annotations
+import sys
+from typing import Dict, Iterable, List, Optional, Set, cast
+
+class State:
+    """State in a nutshell"""
+    __slots__ = ("label",)
+
+    def __init__(self, label: str = "") -> None:
+        self.label = label
+    def change_label(self, label: str):
+        """Function that changes labels"""
+        self.label = label
+    def __repr__(self) -> str:
+        return self.label
+
+class Edges(Dict[State, Dict[str, Set[State]]]):
+    """Transitions (or predecessors) of an automaton: every state is mapped to its row,
+    which maps letters to sets of states. The rows may be shared with the Edges of the
+    copies of the automaton (copy-on-write), so only the rows of the states in {owned}
+    can be changed in place."""
+    __slots__ = ("owned",)
+
+    def __init__(self, rows: Optional[Dict[State, Dict[str, Set[State]]]] = None,
+                 owned: bool = False) -> None:
+        super().__init__(rows or {})
+        self.owned: Set[State] = set(self) if owned else set()
+
+    def writable(self, state: State) -> Dict[str, Set[State]]:
+        """Returns the row of {state} which can be changed in place.
+        A row shared with a copy is cloned first."""
+        row: Optional[Dict[str, Set[State]]] = self.get(state)
+        if row is None:
+            row = self[state] = {}
+        elif state not in self.owned:
+            row = self[state] = {letter: set(others) for letter, others in row.items()}
+        self.owned.add(state)
+        return row
+
+    def drop(self, state: State) -> Dict[str, Set[State]]:
+        """Removes the row of {state} and returns it."""
+        self.owned.discard(state)
+        return self.pop(state, {})
+
+    def share(self) -> Edges:
+        """Returns a copy which shares every row with self. The rows are shared now,
+        so both of them clone a row before changing it."""
+        self.owned.clear()
+        return Edges(self)
+
+    def replaced(self, replacements: Dict[State, State]) -> Edges:
+        """Returns a copy with every state replaced by replacements[state].
+        The new rows are not shared."""
+        return Edges({replacements[state]: {letter: {replacements[other] for other in others}
+                                            for letter, others in row.items()}
+                      for state, row in self.items()}, owned=True)
+
+    def reachable(self, starts: Iterable[State]) -> Set[State]:
+        """Returns the states reachable from {starts}."""
+        reached: Set[State] = set(starts)
+        stack: List[State] = list(reached)
+        while stack:
+            for targets in self.get(stack.pop(), {}).values():
+                for target in targets:
+                    if target not in reached:
+                        reached.add(target)
+                        stack.append(target)
+        return reached
+
+class StateTable:
+    """The states of an automaton by ID. slots[i] is the state with ID i or None if
+    it was removed. IDs do not change when states are removed, only StateTable.compact
+    renumbers them. {states_dict} maps the labels to the IDs."""
+    __slots__ = ("slots", "states_dict", "__states")
+
+    def __init__(self, slots: Optional[List[Optional[State]]] = None,
+                 states_dict: Optional[Dict[str, int]] = None) -> None:
+        self.slots: List[Optional[State]] = [] if slots is None else slots
+        if states_dict is None:
+            states_dict = {state.label: index for index, state in enumerate(self.slots)
+                           if state is not None}
+        self.states_dict: Dict[str, int] = states_dict
+        self.__states: Optional[List[State]] = None
+
+    @property
+    def states(self) -> List[State]:
+        """The states in the order of their IDs."""
+        if len(self.slots) == len(self.states_dict):
+            return cast(List[State], self.slots)
+        if self.__states is None:
+            self.__states = [state for state in self.slots if state is not None]
+        return self.__states
+
+    def find(self, label: str) -> Optional[State]:
+        """Returns the state with {label} or None if there is no such state."""
+        index: Optional[int] = self.states_dict.get(label)
+        return None if index is None else self.slots[index]
+
+    def add(self, label: str = "") -> str:
+        """Adds a state and returns its label. If {label} is empty or taken,
+        the smallest free number not less than the new ID is used."""
+        if not label or label in self.states_dict:
+            number: int = len(self.slots)
+            while str(number) in self.states_dict:
+                number += 1
+            label = str(number)
+        label = sys.intern(label)
+        self.slots.append(State(label))
+        self.states_dict[label] = len(self.slots) - 1
+        self.__states = None
+        return label
+
+    def remove(self, label: str) -> None:
+        """Leaves a tombstone in place of the state with {label}."""
+        self.slots[self.states_dict.pop(label)] = None
+        self.__states = None
+
+    def compact(self) -> None:
+        """Drops the IDs of the removed states, so the IDs become 0, 1, ... again."""
+        states: List[State] = list(self.states)
+        self.slots = list(states)
+        self.states_dict = {state.label: index for index, state in enumerate(states)}
+        self.__states = None
+
+    def copy(self) -> StateTable:
+        """Returns a copy sharing the states with self."""
+        return StateTable(list(self.slots), dict(self.states_dict))
+
+    def replaced(self, replacements: Dict[State, State]) -> StateTable:
+        """Returns a copy with every state replaced by replacements[state]."""
+        return StateTable([None if state is None else replacements[state]
+                           for state in self.slots])
@@ -1,9 +1,10 @@
 """Module for managing automatons."""
 
 import os
-from typing import Dict, List, Set, Tuple
+from typing import Dict, List, Optional, Set, Tuple
 import graphviz # type: ignore
 from src.automaton.automaton import Automaton
+from src.automaton.multi_matcher import MultiMatcher
 from src.regexpr.reg_expr import RegExpr
 
 NOT_FOUND_ERROR_MSG: str = "Automaton is not found!"
@@ -105,6 +106,21 @@ class Controller:
             raise KeyError(NOT_FOUND_ERROR_MSG)
         return self.automatons[name].accepts_word(word)
 
+    def multi_matcher(self, names: Optional[List[str]] = None) -> MultiMatcher:
+        """Returns a MultiMatcher for the automatons <names> (all automatons by default).
+        The automatons are frozen and the states of their product are built lazily, so keep
+        the matcher to check many words; build a new one after the automatons change."""
+        if names is None:
+            names = list(self.automatons)
+        if any(name not in self.automatons for name in names):
+            raise KeyError(NOT_FOUND_ERROR_MSG)
+        return MultiMatcher([self.automatons[name].freeze() for name in names], names)
+
+    def accepting_automatons(self, word: str, names: Optional[List[str]] = None) -> List[str]:
+        """Returns the names of the automatons among <names> (all by default) accepting <word>.
+        Every call builds a new MultiMatcher, use multi_matcher() for many words."""
+        return self.multi_matcher(names).matches(word)
+
     def make_total(self, name: str) -> None:
         """Modifies <name> to be total."""
         if not name in self.automatons:
@@ -147,6 +163,24 @@ class Controller:
             raise KeyError(NOT_FOUND_ERROR_MSG)
         return self.automatons[name1].intersection(self.automatons[name2])
 
+    def equivalent(self, name1: str, name2: str) -> bool:
+        """Checks if L(<name1>) = L(<name2>)"""
+        if name1 not in self.automatons or name2 not in self.automatons:
+            raise KeyError(NOT_FOUND_ERROR_MSG)
+        return self.automatons[name1].equivalent(self.automatons[name2])
+
+    def distinguishing_word(self, name1: str, name2: str) -> Optional[str]:
+        """Returns a shortest word in exactly one of L(<name1>) and L(<name2>) or None"""
+        if name1 not in self.automatons or name2 not in self.automatons:
+            raise KeyError(NOT_FOUND_ERROR_MSG)
+        return self.automatons[name1].distinguishing_word(self.automatons[name2])
+
+    def includes(self, name1: str, name2: str) -> bool:
+        """Checks if L(<name2>) is a subset of L(<name1>)"""
+        if name1 not in self.automatons or name2 not in self.automatons:
+            raise KeyError(NOT_FOUND_ERROR_MSG)
+        return self.automatons[name1].includes(self.automatons[name2])
+
     def determinize(self, name: str) -> Automaton:
         """Returns a determinized version of <name>"""
         if name not in self.automatons:
@@ -0,0 +1,169 @@
+"""Module for matching words with Brzozowski derivatives of regexes.
+
+The derivative of a regex r with letter a is a regex for the words w such that
+aw is in L(r). A word is matched by taking derivatives letter by letter and checking
+if the last one accepts the empty word. The smart constructors below normalize the
+regexes (unions are flattened, sorted and without duplicates), so every regex has
+finitely many different derivatives and they can be the states of a DFA."""
+
+from __future__ import annotations
+from typing import Dict, Iterable, List, Optional, Tuple
+from src.regexpr.parser import CONCAT, EMPTY, EPSILON, LETTER, STAR, UNION, RegexNode
+
+EMPTY_NODE: RegexNode = RegexNode(EMPTY)
+EPSILON_NODE: RegexNode = RegexNode(EPSILON)
+
+def make_union(parts: Iterable[RegexNode]) -> RegexNode:
+    """Returns the union of regexes. Nested unions are flattened, the empty language
+    and duplicates are dropped and the operands are sorted."""
+    operands: Dict[RegexNode, None] = {}
+    for part in parts:
+        if part.kind == UNION:
+            operands.update(dict.fromkeys(part.children))
+        elif part.kind != EMPTY:
+            operands[part] = None
+    if not operands:
+        return EMPTY_NODE
+    if len(operands) == 1:
+        return next(iter(operands))
+    return RegexNode(UNION, tuple(sorted(operands, key=str)))
+
+def make_concat(parts: Iterable[RegexNode]) -> RegexNode:
+    """Returns the concatenation of regexes. Nested concatenations are flattened
+    and $ is dropped. If one of the regexes is the empty language, so is the result."""
+    operands: List[RegexNode] = []
+    for part in parts:
+        if part.kind == EMPTY:
+            return EMPTY_NODE
+        if part.kind == CONCAT:
+            operands.extend(part.children)
+        elif part.kind != EPSILON:
+            operands.append(part)
+    if not operands:
+        return EPSILON_NODE
+    if len(operands) == 1:
+        return operands[0]
+    return RegexNode(CONCAT, tuple(operands))
+
+def make_star(part: RegexNode) -> RegexNode:
+    """Returns the Kleene star of a regex."""
+    if part.kind in (EMPTY, EPSILON):
+        return EPSILON_NODE
+    return part if part.kind == STAR else RegexNode(STAR, (part,))
+
+def normalize(node: RegexNode) -> RegexNode:
+    """Rebuilds a syntax tree with the smart constructors."""
+    normalized: List[RegexNode] = []
+    for current in node.postorder():
+        if not current.children:
+            normalized.append(current)
+            continue
+        operands: List[RegexNode] = normalized[-len(current.children):]
+        del normalized[-len(current.children):]
+        if current.kind == UNION:
+            normalized.append(make_union(operands))
+        elif current.kind == CONCAT:
+            normalized.append(make_concat(operands))
+        else:
+            normalized.append(make_star(operands[0]))
+    return normalized[-1]
+
+def nullable(node: RegexNode) -> bool:
+    """Checks if the empty word is in L(node)."""
+    return node.nullable
+
+def derivative(node: RegexNode, letter: str) -> RegexNode:
+    """Returns the derivative of {node} with {letter}. The derivatives of the children
+    are found first with an explicit stack, so deep regexes do not exhaust the Python
+    stack, and equal subtrees are derived once."""
+    derivatives: Dict[RegexNode, RegexNode] = {}
+    stack: List[Tuple[RegexNode, bool]] = [(node, False)]
+    while stack:
+        current, ready = stack.pop()
+        if current in derivatives:
+            continue
+        # (r1 r2 ... rk)' = r1' r2 ... rk + (r2 ... rk)' if r1 is nullable, so only the
+        # children up to the first one which is not nullable are derived.
+        children: Tuple[RegexNode, ...] = current.children
+        if current.kind == CONCAT:
+            needed: int = next((index + 1 for index, child in enumerate(children)
+                                if not child.nullable), len(children))
+            children = children[:needed]
+        if not ready and children:
+            stack.append((current, True))
+            stack.extend((child, False) for child in children)
+            continue
+        if current.kind == LETTER:
+            result: RegexNode = EPSILON_NODE if current.letter == letter else EMPTY_NODE
+        elif current.kind == UNION:
+            result = make_union(derivatives[child] for child in children)
+        elif current.kind == STAR:
+            result = make_concat((derivatives[children[0]], current))
+        elif current.kind == CONCAT:
+            result = make_union(make_concat((derivatives[child],
+                                             *current.children[index + 1:]))
+                                for index, child in enumerate(children))
+        else:
+            result = EMPTY_NODE
+        derivatives[current] = result
+    return derivatives[node]
+
+class DerivativeMatcher:
+    """Matches words with a DFA whose states are the derivatives of a regex. The
+    states are built lazily: only the derivatives reached by the checked words are
+    computed and every one of them is stored once. When more than {max_states}
+    states are stored, the cache is cleared and built again."""
+
+    def __init__(self, node: RegexNode, max_states: int = 10000) -> None:
+        self.start = normalize(node)
+        self.max_states = max_states
+        self.numbers: Dict[RegexNode, int] = {}
+        self.nodes: List[RegexNode] = []
+        self.finals: List[bool] = []
+        self.transitions: List[Dict[str, int]] = []
+        self.clear()
+
+    def clear(self) -> None:
+        """Drops all states but the start."""
+        self.numbers = {}
+        self.nodes = []
+        self.finals = []
+        self.transitions = []
+        self.__state(self.start)
+
+    def __len__(self) -> int:
+        return len(self.nodes)
+
+    def __state(self, node: RegexNode) -> int:
+        """Returns the number of the state for {node}, adding it if it is new."""
+        number: Optional[int] = self.numbers.get(node)
+        if number is None:
+            number = self.numbers[node] = len(self.nodes)
+            self.nodes.append(node)
+            self.finals.append(nullable(node))
+            self.transitions.append({})
+        return number
+
+    def step(self, state: int, letter: str) -> int:
+        """Returns the state reached from {state} with {letter}. If the cache is
+        cleared, the numbers of the states change, so only the result is valid."""
+        target: Optional[int] = self.transitions[state].get(letter)
+        if target is not None:
+            return target
+        source: RegexNode = self.nodes[state]
+        node: RegexNode = derivative(source, letter)
+        if node not in self.numbers and len(self.nodes) >= self.max_states:
+            self.clear()
+            state = self.__state(source)
+        target = self.__state(node)
+        self.transitions[state][letter] = target
+        return target
+
+    def matches(self, word: str) -> bool:
+        """Checks if word is in the regex language."""
+        state: int = 0
+        for letter in word:
+            state = self.step(state, letter)
+            if self.nodes[state].kind == EMPTY:
+                return False
+        return self.finals[state]
@@ -0,0 +1,147 @@
+"""Module for splitting texts into tokens described by regular expressions."""
+
+from __future__ import annotations
+from array import array
+from collections import deque
+from itertools import chain
+from typing import (Deque, Dict, FrozenSet, Iterable, Iterator, List, NamedTuple, Optional,
+                    Sequence, Tuple, Union)
+from src.automaton.automaton import Automaton
+from src.automaton.frozen_nfa import FrozenNFA
+from src.regexpr.reg_expr import RegExpr
+
+NO_RULE: int = -1
+# Code of the letters which are not in the alphabet of any rule.
+NO_LETTER: int = -1
+
+class LexerError(ValueError):
+    """Error for texts which can not be split into tokens. It holds the position
+    of the first symbol which does not start a token."""
+    def __init__(self, position: int) -> None:
+        super().__init__(f"No token matches the text (position {position}).")
+        self.position = position
+
+class Token(NamedTuple):
+    """Token found by Lexer: the name of its rule, its text and its position."""
+    name: str
+    text: str
+    position: int
+
+class Lexer:
+    """Splits texts into tokens. The rules are pairs of a name and a regex (a string or
+    RegExpr) or an automaton. All of them are compiled into one DFA: its states are sets
+    of states of the Glushkov automatons of the rules and accept[q] is the number of the
+    first rule accepting in state q (NO_RULE if there is none). Every token is the
+    longest prefix of the rest of the text accepted by a rule; if many rules accept it,
+    the first one wins. The symbols in {skip} are dropped between tokens."""
+
+    def __init__(self, rules: Sequence[Tuple[str, Union[str, RegExpr, Automaton]]],
+                 skip: str = "") -> None:
+        self.names: Tuple[str, ...] = tuple(name for name, _ in rules)
+        self.skip: FrozenSet[str] = frozenset(skip)
+        frozens: List[FrozenNFA] = []
+        for _, rule in rules:
+            if isinstance(rule, str):
+                rule = RegExpr(rule)
+            frozens.append((rule.glushkov() if isinstance(rule, RegExpr) else rule).freeze())
+        alphabet: List[str] = sorted(set(chain.from_iterable(frozen.alphabet
+                                                             for frozen in frozens)))
+        self.letters: Dict[str, int] = {letter: code for code, letter in enumerate(alphabet)}
+        self.width: int = len(alphabet)
+        self.table: array = array("i")
+        self.accept: List[int] = []
+        self.__determinize(frozens, alphabet)
+
+    def __determinize(self, frozens: List[FrozenNFA], alphabet: List[str]) -> None:
+        """Builds the DFA of the rules with the subset construction. The empty subset
+        is not a state: its transitions are NO_RULE in the table."""
+        # The states of the rules are pairs (number of rule, state).
+        start: FrozenSet[Tuple[int, int]] = frozenset(
+            (rule, state) for rule, frozen in enumerate(frozens) for state in frozen.starts)
+        numbers: Dict[FrozenSet[Tuple[int, int]], int] = {start: 0}
+        subsets: Deque[FrozenSet[Tuple[int, int]]] = deque([start])
+        while subsets:
+            current: FrozenSet[Tuple[int, int]] = subsets.popleft()
+            self.accept.append(min((rule for rule, state in current
+                                    if frozens[rule].finals[state]), default=NO_RULE))
+            for letter in alphabet:
+                target: FrozenSet[Tuple[int, int]] = frozenset(
+                    (rule, other) for rule, state in current
+                    for other in frozens[rule].successors(state, letter))
+                if not target:
+                    self.table.append(NO_RULE)
+                    continue
+                number: Optional[int] = numbers.get(target)
+                if number is None:
+                    number = numbers[target] = len(numbers)
+                    subsets.append(target)
+                self.table.append(number)
+
+    def __len__(self) -> int:
+        return len(self.accept)
+
+    def tokenize(self, text: str) -> Iterator[Token]:
+        """Yields the tokens of the text one by one. Raises LexerError if the rest of
+        the text does not start with a token (or a token would be empty)."""
+        return self.tokenize_stream([text])
+
+    def tokenize_stream(self, chunks: Iterable[str]) -> Iterator[Token]:
+        """Yields the tokens of the text made of {chunks}, e.g.
+        iter(lambda: file.read(1 << 16), ""). The text is read once: the DFA goes on
+        from where it stopped when a chunk ends, and only the part of the text after
+        the last token is kept."""
+        accept: List[int] = self.accept
+        remaining: Iterator[str] = iter(chunks)
+        buffer: str = ""
+        # Position of buffer[0] in the whole text.
+        offset: int = 0
+        # The token being read starts at buffer[begin] and buffer[begin:index] is read.
+        begin: int = 0
+        index: int = 0
+        state: int = 0
+        # The longest token found so far ends at buffer[end] and has rule number {rule}.
+        end: int = -1
+        rule: int = accept[0]
+        exhausted: bool = False
+        while True:
+            if begin == index:
+                while index < len(buffer) and buffer[index] in self.skip:
+                    index += 1
+                begin = index
+                end = begin if rule != NO_RULE else -1
+            index, state, (end, rule) = self.__scan(buffer, index, state, (end, rule))
+            if index == len(buffer) and state != NO_RULE and not exhausted:
+                # The token may go on in the next chunk.
+                chunk: Optional[str] = next(remaining, None)
+                if chunk is None:
+                    exhausted = True
+                else:
+                    buffer, offset = buffer[begin:] + chunk, offset + begin
+                    index, end = index - begin, end - begin if end >= 0 else -1
+                    begin = 0
+                continue
+            if begin == len(buffer) and exhausted:
+                return
+            if end <= begin:
+                raise LexerError(offset + begin)
+            yield Token(self.names[rule], buffer[begin:end], offset + begin)
+            begin = index = end
+            state, rule = 0, accept[0]
+
+    def __scan(self, buffer: str, index: int, state: int, found: Tuple[int, int])\
+        -> Tuple[int, int, Tuple[int, int]]:
+        """Runs the DFA on buffer[index:] from {state} until the buffer ends or no rule
+        can accept. {found} is the end and the rule number of the longest token so far.
+        Returns the index and the state where the DFA stopped and the new {found}."""
+        letters: Dict[str, int] = self.letters
+        table: array = self.table
+        accept: List[int] = self.accept
+        width: int = self.width
+        while index < len(buffer) and state != NO_RULE:
+            code: int = letters.get(buffer[index], NO_LETTER)
+            state = table[state * width + code] if code != NO_LETTER else NO_RULE
+            if state != NO_RULE:
+                index += 1
+                if accept[state] != NO_RULE:
+                    found = index, accept[state]
+        return index, state, found
@@ -0,0 +1,187 @@
+"""Module for parsing regular expressions into syntax trees.
+
+The grammar follows the inductive definition of regular expressions:
+    union  -> concat ("+" concat)*
+    concat -> star star*
+    star   -> atom "*"*
+    atom   -> letter | "$" | "(" union ")"
+"""
+
+from __future__ import annotations
+from typing import Iterator, List, Optional, Tuple
+
+LETTER: str = "letter"
+EPSILON: str = "$"
+UNION: str = "+"
+CONCAT: str = "."
+STAR: str = "*"
+# The empty language has no syntax in regexes. Only derivatives produce it.
+EMPTY: str = "empty"
+
+class RegexSyntaxError(ValueError):
+    """Error for invalid regular expressions. It holds the position of the wrong symbol."""
+    def __init__(self, message: str, position: int) -> None:
+        super().__init__(f"{message} (position {position}).")
+        self.position = position
+
+class RegexNode:
+    """Immutable node of a regex syntax tree. {kind} is one of LETTER, EPSILON,
+    UNION, CONCAT, STAR and EMPTY. Unions and concatenations keep all their operands
+    in {children}, so long regexes give shallow trees. {nullable} tells if the empty
+    word is in the language of the node. Nested brackets still give deep trees, so no
+    method of the node is recursive."""
+    __slots__ = ("kind", "letter", "children", "nullable", "_hash", "_text")
+    kind: str
+    letter: str
+    children: Tuple[RegexNode, ...]
+    nullable: bool
+    _hash: int
+    _text: Optional[str]
+
+    def __init__(self, kind: str, children: Tuple[RegexNode, ...] = (), letter: str = "") -> None:
+        nullable: bool = kind in (EPSILON, STAR)
+        if kind == UNION:
+            nullable = any(child.nullable for child in children)
+        elif kind == CONCAT:
+            nullable = all(child.nullable for child in children)
+        for name, value in (("kind", kind), ("letter", letter), ("children", children),
+                            ("nullable", nullable), ("_hash", hash((kind, letter, children))),
+                            ("_text", None)):
+            object.__setattr__(self, name, value)
+
+    def __setattr__(self, name: str, value) -> None:
+        raise AttributeError("RegexNode is immutable.")
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, RegexNode):
+            return False
+        pairs: List[Tuple[RegexNode, RegexNode]] = [(self, other)]
+        while pairs:
+            first, second = pairs.pop()
+            if first is second:
+                continue
+            if first._hash != second._hash or first.kind != second.kind\
+                    or first.letter != second.letter\
+                        or len(first.children) != len(second.children):
+                return False
+            pairs.extend(zip(first.children, second.children))
+        return True
+
+    def __hash__(self) -> int:
+        return self._hash
+
+    def postorder(self) -> Iterator[RegexNode]:
+        """Yields the nodes of the tree, children before their parent."""
+        stack: List[Tuple[RegexNode, bool]] = [(self, False)]
+        while stack:
+            node, visited = stack.pop()
+            if visited or not node.children:
+                yield node
+                continue
+            stack.append((node, True))
+            stack.extend((child, False) for child in reversed(node.children))
+
+    def __str__(self) -> str:
+        # The texts are written from the leaves; subtrees written before are skipped.
+        stack: List[Tuple[RegexNode, bool]] = [(self, False)]
+        while self._text is None:
+            node, visited = stack.pop()
+            if visited:
+                object.__setattr__(node, "_text",
+                                   _format(node, [str(child._text) for child in node.children]))
+                continue
+            stack.append((node, True))
+            stack.extend((child, False) for child in node.children if child._text is None)
+        return self._text
+
+    def __repr__(self) -> str:
+        return f"RegexNode({str(self)!r})"
+
+def _format(node: RegexNode, operands: List[str]) -> str:
+    """Writes {node} back as a regex, given the texts of its children."""
+    if node.kind == LETTER:
+        return node.letter
+    if node.kind == EPSILON:
+        return EPSILON
+    if node.kind == EMPTY:
+        return ""
+    if node.kind == STAR:
+        inner: str = operands[0]
+        return f"{inner}*" if len(inner) == 1 else f"({inner})*"
+    if node.kind == UNION:
+        return "+".join(operands)
+    return "".join(f"({text})" if child.kind == UNION else text
+                   for child, text in zip(node.children, operands))
+
+def is_letter(symbol: str) -> bool:
+    """Checks if symbol is from alphabet."""
+    return symbol.isalpha() or symbol.isdigit()
+
+def tokenize(regex: str) -> str:
+    """Checks that every symbol of the regex is a letter, $, bracket, + or *."""
+    for position, symbol in enumerate(regex):
+        if not is_letter(symbol) and symbol not in "$()+*":
+            raise RegexSyntaxError(f"Unknown symbol '{symbol}'", position)
+    return regex
+
+class _Parser:
+    """Parser with an explicit stack of the open brackets instead of recursion, so
+    deeply nested regexes do not exhaust the Python stack. Every symbol is read once,
+    so parsing is linear."""
+    def __init__(self, regex: str) -> None:
+        self.regex = tokenize(regex)
+        # The operands of the union and of the concatenation which are being read.
+        self.unions: List[RegexNode] = []
+        self.parts: List[RegexNode] = []
+        # The unions and concatenations outside of every open bracket.
+        self.stack: List[Tuple[List[RegexNode], List[RegexNode]]] = []
+
+    def error(self, position: int) -> RegexSyntaxError:
+        """Returns error for the symbol at {position}."""
+        message: str = f"Unexpected symbol '{self.regex[position]}'"\
+            if position < len(self.regex) else "Unexpected end of regular expression"
+        return RegexSyntaxError(message, position)
+
+    def end_concat(self, position: int) -> None:
+        """Adds the concatenation which ends at {position} to the union. It can not be
+        empty, so neither can the operands of + and the regexes in brackets."""
+        if not self.parts:
+            raise self.error(position)
+        self.unions.append(self.parts[0] if len(self.parts) == 1
+                           else RegexNode(CONCAT, tuple(self.parts)))
+        self.parts = []
+
+    def end_union(self, position: int) -> RegexNode:
+        """Returns the union which ends at {position}."""
+        self.end_concat(position)
+        return self.unions[0] if len(self.unions) == 1 else RegexNode(UNION, tuple(self.unions))
+
+    def parse(self) -> RegexNode:
+        """Parses the whole regex."""
+        for position, symbol in enumerate(self.regex):
+            if symbol == "(":
+                self.stack.append((self.unions, self.parts))
+                self.unions, self.parts = [], []
+            elif symbol == ")":
+                node: RegexNode = self.end_union(position)
+                if not self.stack:
+                    raise self.error(position)
+                self.unions, self.parts = self.stack.pop()
+                self.parts.append(node)
+            elif symbol == UNION:
+                self.end_concat(position)
+            elif symbol == STAR:
+                if not self.parts:
+                    raise self.error(position)
+                self.parts[-1] = RegexNode(STAR, (self.parts[-1],))
+            elif symbol == EPSILON:
+                self.parts.append(RegexNode(EPSILON))
+            else:
+                self.parts.append(RegexNode(LETTER, letter=symbol))
+        if self.stack:
+            raise self.error(len(self.regex))
+        return self.end_union(len(self.regex))
+
+def parse(regex: str) -> RegexNode:
+    """Parses regex into a syntax tree. Raises RegexSyntaxError if it is not valid."""
+    return _Parser(regex).parse()
@@ -1,95 +1,143 @@
 """Module for working with regular expressions."""
-from typing import List
+from typing import List, Optional, Set, Tuple
 from src.automaton.automaton import Automaton
+from src.regexpr.derivatives import DerivativeMatcher
+from src.regexpr.parser import EPSILON, LETTER, STAR, UNION, RegexNode, RegexSyntaxError, parse
 
-def is_letter(symbol: str) -> bool:
-    """Checks if symbol is from alphabet."""
-    return symbol.isalpha() or symbol.isdigit()
+def _combine(kind: str, operands: List[Tuple[bool, Set[int], Set[int]]],
+             follow: List[Set[int]]) -> Tuple[bool, Set[int], Set[int]]:
+    """Returns (nullable, first, last) of the union or the concatenation of the
+    operands. The follow sets of the concatenation are updated in place."""
+    nullable, first, last = operands[0]
+    for operand_nullable, operand_first, operand_last in operands[1:]:
+        if kind == UNION:
+            first, last = first | operand_first, last | operand_last
+            nullable = nullable or operand_nullable
+        else:
+            for position in last:
+                follow[position] |= operand_first
+            first = first | operand_first if nullable else first
+            last = last | operand_last if operand_nullable else operand_last
+            nullable = nullable and operand_nullable
+    return nullable, first, last
 
 class RegExpr:
     """Class for working with regular expressions."""
 
     def __init__(self, regex: str):
         self.regex = regex
+        # The matcher used by RegExpr.matches and the regex it was built for.
+        self.__matcher: Optional[Tuple[str, DerivativeMatcher]] = None
+
+    def parse(self) -> RegexNode:
+        """Returns the syntax tree of the regex. Raises RegexSyntaxError
+        (a ValueError) with the position of the first wrong symbol."""
+        return parse(self.regex)
 
     def validate(self) -> bool:
         """Function for checking if regex is valid."""
-        return self.__validate(self.regex)
+        try:
+            self.parse()
+        except RegexSyntaxError:
+            return False
+        return True
+
+    def matcher(self, max_states: int = 10000) -> DerivativeMatcher:
+        """Returns a matcher which builds the states of a DFA for the regex
+        (its derivatives) only when the checked words reach them."""
+        return DerivativeMatcher(self.parse(), max_states)
+
+    def matches(self, word: str) -> bool:
+        """Checks if word is in the regex language without building an automaton.
+        The matcher is kept, so the next checks reuse the already built states."""
+        if self.__matcher is None or self.__matcher[0] != self.regex:
+            self.__matcher = (self.regex, self.matcher())
+        return self.__matcher[1].matches(word)
 
     def convert_in_rpn(self) -> str:
-        """Converts regex into reverse polish notation using Shunting-Yard algorithm."""
+        """Converts regex into reverse polish notation. Unions and concatenations
+        are left associative."""
         output: List[str] = []
-        stack: List[str] = []
-        for i, value in enumerate(self.regex):
-            symbol: str = value
-            if symbol.isalpha() or symbol.isdigit() or symbol == "$":
-                output.append(symbol)
-            elif symbol == "(":
-                stack.append(symbol)
-            elif symbol == "*":
-                output.append(symbol)
-            elif symbol == ")":
-                while stack[-1] != "(":
-                    output.append(stack.pop())
-                stack.pop()
-            elif symbol == "+":
-                while stack and (stack[-1] == "." or stack[-1] == "+"):
-                    output.append(stack.pop())
-                stack.append(symbol)
-            if i != len(self.regex) - 1:
-                left: str = self.regex[i]
-                right: str = self.regex[i + 1]
-                cond_1: bool = is_letter(left) and (right == "(" or is_letter(right))
-                cond_2: bool = left == ")" and (is_letter(right) or right == ")")
-                cond_3: bool = left == "*" and (right == "(" or is_letter(right))
-                if cond_1 or cond_2 or cond_3:
-                    while stack and (stack[-1] == "." or stack[-1] == "*"):
-                        output.append(stack.pop())
-                    stack.append(".")
+        # Holds the nodes being written and the number of their children written so far.
+        stack: List[Tuple[RegexNode, int]] = [(self.parse(), 0)]
         while stack:
-            output.append(stack.pop())
+            node, index = stack.pop()
+            if node.kind == LETTER:
+                output.append(node.letter)
+                continue
+            if node.kind == EPSILON:
+                output.append(EPSILON)
+                continue
+            if index >= 2:
+                output.append(node.kind)
+            if index < len(node.children):
+                stack.append((node, index + 1))
+                stack.append((node.children[index], 0))
+            elif node.kind == STAR:
+                output.append(STAR)
         return "".join(output)
 
-    def __validate(self, current: str) -> bool:
-        """Helper for validating regex. It follows the inductive definition of building regexes."""
-        # r -> r* | (r)
-        # r1, r2 -> r1.r2 | r1 + r2
-        if not current:
-            return False
-        if current == "$" or is_letter(current) or\
-            current[0] == "(" and current[-1] == ")" and self.__validate(current[1:-1]):
-            return True
-        if current[-1] == "*" and self.__validate(current[0:-1]):
-            return True
-        for i, value in enumerate(current):
-            symbol: str = value
-            if symbol == "+" and self.__validate(current[0:i]) and self.__validate(current[i+1:]):
-                return True
-        for i in range(len(current)):
-            if self.__validate(current[0:i]) and self.__validate(current[i:]):
-                return True
-        return False
+    def glushkov(self) -> Automaton:
+        """Returns the position (Glushkov) automaton of the regex. It has no epsilon
+        transitions and one state for every letter occurrence plus the starting state 0.
+        The first, last and follow sets are found in one pass over the syntax tree."""
+        letters: List[str] = []
+        follow: List[Set[int]] = [set()]
+        # Holds (nullable, first, last) for the already processed subtrees.
+        stack: List[Tuple[bool, Set[int], Set[int]]] = []
+        for node in self.parse().postorder():
+            if node.kind == LETTER:
+                letters.append(node.letter)
+                follow.append(set())
+                stack.append((False, {len(letters)}, {len(letters)}))
+            elif node.kind == EPSILON:
+                stack.append((True, set(), set()))
+            elif node.kind == STAR:
+                _, first, last = stack.pop()
+                for position in last:
+                    follow[position] |= first
+                stack.append((True, first, last))
+            else:
+                operands: List[Tuple[bool, Set[int], Set[int]]] = stack[-len(node.children):]
+                del stack[-len(node.children):]
+                stack.append(_combine(node.kind, operands, follow))
+        nullable, follow[0], last = stack[-1]
+
+        return Automaton.from_edges(
+            len(follow), ((position, letters[target - 1], target)
+                          for position, targets in enumerate(follow) for target in sorted(targets)),
+            [0], last | ({0} if nullable else set()))
+
+    def compile(self, minimize: bool = True, trim: bool = False) -> Automaton:
+        """Reads valid regular expression and returns an automaton with same language.
+        The automaton is built with the Glushkov construction. If {minimize} is set,
+        the minimal deterministic automaton is returned. If {trim} is set, its useless
+        states (like the dead state of the minimal automaton) are removed and their
+        number is kept in the trimmed attribute of the result."""
+        result: Automaton = self.glushkov()
+        if minimize:
+            result = result.determinize().minimize()
+        if trim:
+            result.trim()
+        return result
 
-    def compile(self) -> Automaton:
-        """Reads valid regular expression and returns an automaton with same language."""
-        # if not self.validate():
-        #     raise ValueError("Regular expression is NOT valid!")
-        regex_rpn: str = self.convert_in_rpn()
-        stack: List[Automaton] = []
-        for symbol in regex_rpn:
-            if symbol == "+":
-                first: Automaton = stack.pop()
-                second: Automaton = stack.pop()
-                stack.append(first.union(second))
-            elif symbol == "*":
-                starred: Automaton = stack.pop()
-                stack.append(starred.star())
-            elif symbol == ".":
-                concat_1: Automaton = stack.pop()
-                concat_2: Automaton = stack.pop()
-                stack.append(concat_2.concat(concat_1))
-            elif symbol == "$":
-                stack.append(Automaton.singleton_epsilon())
+    def kleene_compile(self) -> Automaton:
+        """Returns the minimal automaton of the regex, built with the union,
+        concatenation and Kleene star constructions of Kleene's theorem."""
+        automatons: List[Automaton] = []
+        for node in self.parse().postorder():
+            if node.kind == LETTER:
+                automatons.append(Automaton.by_letter(node.letter))
+            elif node.kind == EPSILON:
+                automatons.append(Automaton.singleton_epsilon())
+            elif node.kind == STAR:
+                automatons.append(automatons.pop().star())
             else:
-                stack.append(Automaton.by_letter(symbol))
-        return stack[-1].minimize()
+                operands: List[Automaton] = automatons[-len(node.children):]
+                del automatons[-len(node.children):]
+                result: Automaton = operands[0]
+                for operand in operands[1:]:
+                    result = operand.union(result) if node.kind == UNION\
+                        else result.concat(operand)
+                automatons.append(result)
+        return automatons[-1].minimize()
@@ -1,3 +1,8 @@
+import io
+import itertools
+import mmap
+import random
+import re
 import pytest
 from src.automaton.automaton import Automaton
 
@@ -19,6 +24,34 @@ def test_remove_state():
     assert a.states[0].label == '0'
     assert not a.remove_state('invalid')
 
+def test_remove_state_stable_ids():
+    a: Automaton = Automaton()
+    for label in ['0', '1', '2', '3']:
+        a.add_state(label)
+    a.set_start('0')
+    a.add_transition('0', 'a', '1')
+    a.add_transition('1', 'a', '2')
+    a.add_transition('1', 'b', '1')
+    a.add_transition('2', 'b', '1')
+    a.add_transition('2', 'a', '3')
+    assert a.remove_state('1')
+    assert [state.label for state in a.states] == ['0', '2', '3']
+    assert a.slots[1] is None
+    assert a.states_dict['3'] == 3
+    assert a.make_state_final('3')
+    assert a.get_state('3') in a.finals
+    assert not a.transitions[a.get_state('0')]['a']
+    assert not a.transitions[a.get_state('2')]['b']
+    assert a.get_state('1') not in a.predecessors
+    assert a.add_state() == '4'
+    a.compact()
+    assert a.states_dict['3'] == 2
+    assert a.states_dict['4'] == 3
+    assert not a.accepts_word('aa')
+    assert a.get_state('3') in a.transitions[a.get_state('2')]['a']
+    assert a.remove_transition('2', 'a', '3')
+    assert not a.predecessors[a.get_state('3')]['a']
+
 def test_make_final():
     a: Automaton = Automaton()
     a.add_state('0')
@@ -110,6 +143,246 @@ def test_accepts_word():
     assert a.accepts_word('a')
     assert not a.accepts_word('bbbabab')
 
+def test_compile():
+    a: Automaton = Automaton()
+    a.add_state('0')
+    a.add_state('1')
+    a.add_state('2')
+    a.set_start('0')
+    a.make_state_final('1')
+    a.add_transition('0', 'a', '1')
+    a.add_transition('0', 'b', '2')
+    a.add_transition('1', 'b', '1')
+    a.add_transition('1', 'a', '1')
+    frozen = a.compile()
+    assert len(frozen) == 3
+    assert frozen.alphabet == ('a', 'b')
+    assert frozen.matches('aabbbbbb')
+    assert frozen.matches('a')
+    assert not frozen.matches('')
+    assert not frozen.matches('bbbabab')
+    assert not frozen.matches('abc')
+    assert frozen.step(frozen.step(frozen.start, 'b'), 'a') == -1
+    with pytest.raises(AttributeError):
+        frozen.start = 1
+
+def test_compile_throws():
+    with pytest.raises(ValueError):
+        a: Automaton = Automaton()
+        a.add_state('0')
+        a.add_state('1')
+        a.set_start('0')
+        a.add_transition('0', 'a', '0')
+        a.add_transition('0', 'a', '1')
+        a.compile()
+
+def test_freeze():
+    a: Automaton = Automaton()
+    a.add_state('0')
+    a.add_state('1')
+    a.add_state('2')
+    a.set_start('0')
+    a.make_state_final('2')
+    a.add_transition('0', 'a', '0')
+    a.add_transition('0', 'b', '0')
+    a.add_transition('0', 'a', '1')
+    a.add_transition('1', 'b', '2')
+    a.add_transition('2', 'c', '2')
+    frozen = a.freeze()
+    assert len(frozen) == 3 and frozen.transition_count() == 5
+    assert list(frozen.successors(0, 'a')) == [0, 1]
+    assert not frozen.successors(1, 'a') and not frozen.successors(1, 'd')
+    words = ['ab', 'aab', 'ba', '', 'abc', 'abd', 'bbabcc']
+    assert frozen.matches_many(words) == [a.accepts_word(word) for word in words]
+    with pytest.raises(AttributeError):
+        frozen.starts = frozen.finals
+    thawed: Automaton = Automaton.from_frozen(frozen)
+    assert [state.label for state in thawed.states] == ['0', '1', '2']
+    assert thawed.get_state('2') in thawed.finals and thawed.get_state('0') in thawed.starts
+    assert {(state.label, letter, target.label) for state in thawed.states
+            for letter, targets in thawed.get_state_transitions(state).items()
+            for target in targets} == {('0', 'a', '0'), ('0', 'b', '0'), ('0', 'a', '1'),
+                                       ('1', 'b', '2'), ('2', 'c', '2')}
+    assert Automaton.from_frozen(a.determinize().compile()).accepts_words(words)\
+        == frozen.matches_many(words)
+
+def test_from_edges():
+    edges = [(0, 'a', 0), (0, 'b', 0), (0, 'a', 1), (1, 'b', 2), (1, 'b', 2)]
+    a: Automaton = Automaton.from_edges(3, edges, starts=[0], finals=[2])
+    assert [state.label for state in a.states] == ['0', '1', '2']
+    assert a.alphabet == {'a', 'b'}
+    assert a.accepts_words(['ab', 'bab', 'ba', '']) == [True, True, False, False]
+    assert a.get_state('1') in a.get_state_predecessors(a.get_state('2'))['b']
+    a.remove_state('1')
+    assert not a.accepts_word('ab')
+    assert not a.add_transition('0', 'a', '0')
+    assert not Automaton.from_edges(1, [(0, 'a', 0)]).accepts_word('a')
+    labeled: Automaton = Automaton.from_edges(2, zip([0], ['c'], [1]), [0], [1], ['p', 'q'])
+    assert labeled.accepts_word('c') and labeled.get_state('q') in labeled.finals
+
+@pytest.mark.parametrize('size, edges, starts, labels', [
+    (2, [(0, 'a', 2)], [0], None),
+    (2, [(0, 'a', -1)], [0], None),
+    (2, [(0, 'a', 1)], [-2], None),
+    (2, [], [0], ['p', 'p']),
+    (2, [], [0], ['p']),
+])
+def test_from_edges_throws(size, edges, starts, labels):
+    with pytest.raises(ValueError):
+        Automaton.from_edges(size, edges, starts, labels=labels)
+
+@pytest.mark.parametrize('words', [
+    ['ab', 'abc', 'b', 'bc', 'c', 'cc'],
+    ['cc', 'ab', 'bc', 'b', 'abc', 'c', 'ab'],
+    ['', 'a', 'aa', 'aaa', 'ba', 'bba', 'a', 'ab', 'bbb', 'bab'],
+    [''],
+    [],
+])
+def test_from_words(words):
+    a: Automaton = Automaton.from_words(words)
+    assert a.is_deterministic()
+    every = [''.join(letters) for length in range(5)
+             for letters in itertools.product('abc', repeat=length)]
+    assert a.accepts_words(every) == [word in words for word in every]
+    # The result is minimal, only the trash state of a total automaton is missing.
+    assert len(a.minimize().states) == len(a.total().states) if words else not a.states
+
+def test_from_words_empty():
+    a: Automaton = Automaton.from_words([])
+    assert not a.states and not a.starts and not a.accepts_word('')
+    assert a.trim() == 0 and a.equivalent(Automaton())
+
+@pytest.mark.parametrize('word, max_distance, distance', [
+    ('colour', None, 1),
+    ('color', 0, 0),
+    ('clr', 2, 2),
+    ('clr', 1, None),
+    ('flavor', None, 4),
+    ('', None, 5),
+    ('coolers', 1, 1),
+])
+def test_closest_word(word, max_distance, distance):
+    a: Automaton = Automaton.from_words(['color', 'colors', 'cooler', 'dolor'])
+    found = a.closest_word(word, max_distance)
+    assert (found and found[0]) == distance
+    assert found is None or a.accepts_word(found[1])
+    assert a.accepts_approximately(word, 2) == (a.closest_word(word)[0] <= 2)
+
+def test_levenshtein_matcher():
+    a: Automaton = Automaton.by_letter('a').star().concat(Automaton.by_letter('b'))
+    a.add_state('dead')
+    a.add_transition('0', 'c', 'dead')
+    matcher = a.levenshtein_matcher()
+    assert matcher.closest('bcc') == (2, 'b')
+    assert matcher.closest('aaxab') == (1, 'aaab')
+    assert matcher.distance('aaab') == 0 and matcher.distance('c', 0) is None
+    assert matcher.matches('baaa', 2) and not matcher.matches('baaa', 1)
+    assert Automaton.from_words([]).closest_word('a') is None
+
+@pytest.mark.parametrize('length', [3, 600])
+def test_bit_parallel(length):
+    # (a+b)*a(a+b)^length: the version with 602 states is checked without tables.
+    edges = [(0, 'a', 0), (0, 'b', 0), (0, 'a', 1)]
+    edges += [(state, letter, state + 1) for state in range(1, length + 1) for letter in 'ab']
+    a: Automaton = Automaton.from_edges(length + 2, edges, [0], [length + 1])
+    bits = a.bit_parallel()
+    assert len(bits) == length + 2 and bool(bits.tables) == (length < 512)
+    words = ['b' * 5 + 'a' + 'b' * length, 'a' * length, 'a' * (length + 1),
+             'ab' + 'b' * length, 'a' * (length + 1) + 'c']
+    assert bits.matches_many(words) == [True, False, True, False, False]
+    assert bits.run('a') == bits.start | 2 and bits.step(bits.start, 'c') == 0
+
+def test_matcher():
+    a: Automaton = Automaton()
+    a.add_state('0')
+    a.add_state('1')
+    a.set_start('0')
+    a.make_state_final('1')
+    a.add_transition('0', 'a', '0')
+    a.add_transition('0', 'é', '1')
+    a.add_transition('1', 'b', '1')
+    matcher = a.matcher()
+    assert isinstance(matcher.state, int)
+    assert matcher.feed('aa').feed('').feed('aé').is_accepting()
+    assert not matcher.feed('ba').is_accepting() and matcher.is_dead()
+    matcher.reset()
+    assert not matcher.is_accepting() and not matcher.is_dead()
+    data: bytes = ('a' * 1000 + 'é' + 'b' * 1000).encode('utf-8')
+    assert matcher.feed_file(io.BytesIO(data), buffer_size=7).is_accepting()
+    matcher.reset()
+    assert matcher.feed_file(io.StringIO('a' * 50 + 'é'), 3).is_accepting()
+    nfa: Automaton = a.union(Automaton.by_letter('a'))
+    matcher = nfa.matcher()
+    assert isinstance(matcher.state, frozenset)
+    assert [matcher.feed(chunk).is_accepting() for chunk in ['aa', 'aé', 'b']]\
+        == [False, True, True]
+    matcher.reset()
+    assert matcher.feed('a').is_accepting() and not matcher.feed('c').is_accepting()
+
+@pytest.mark.parametrize('deterministic', [True, False])
+def test_incremental_matcher(deterministic):
+    a: Automaton = Automaton()
+    a.add_state('0')
+    a.add_state('1')
+    a.set_start('0')
+    a.make_state_final('1')
+    a.add_transition('0', 'a', '0')
+    a.add_transition('0', 'b', '1')
+    a.add_transition('1', 'a', '1')
+    if not deterministic:
+        a = a.union(Automaton.by_letter('c'))
+    matcher = a.incremental_matcher(max_checkpoints=4)
+    assert not matcher.append('aaa').is_accepting()
+    assert matcher.append('ab').append('aa').is_accepting()
+    assert matcher.interval == 2 and len(matcher.checkpoints) <= 4
+    assert not matcher.insert(1, 'b').is_accepting()
+    assert matcher.delete(0, 2).word == 'aaabaa' and matcher.is_accepting()
+    assert not matcher.replace(4, 6, 'bc').is_accepting()
+    assert matcher.replace(0, 6, 'c').is_accepting() == (not deterministic)
+    rand = random.Random(0)
+    for _ in range(100):
+        start = rand.randrange(len(matcher) + 1)
+        end = rand.randrange(start, len(matcher) + 1)
+        matcher.replace(start, end, ''.join(rand.choice('aab') for _ in range(rand.randrange(4))))
+        assert matcher.is_accepting() == a.accepts_word(matcher.word)
+    with pytest.raises(ValueError):
+        matcher.delete(3, len(matcher) + 1)
+
+def test_accepts_file(tmp_path):
+    a: Automaton = Automaton.by_letter('a').star()
+    path = tmp_path / 'word.txt'
+    path.write_text('a' * 100000, encoding='utf-8')
+    assert a.accepts_file([str(path)], buffer_size=1000)
+    path.write_text('a' * 100 + 'b', encoding='utf-8')
+    assert not a.accepts_file([str(path)])
+    with open(path, 'rb') as file, mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+        assert a.matcher().feed_file(data, 10).is_dead()
+
+def test_matcher_trash_state():
+    a: Automaton = Automaton.by_letter('a').concat(Automaton.by_letter('b')).determinize()
+    assert a.is_total()
+    for auto in [a, a.union(Automaton.by_letter('c'))]:
+        matcher = auto.matcher()
+        assert not matcher.feed('a').is_dead()
+        assert matcher.feed('a').is_dead() and not matcher.is_accepting()
+        file = io.StringIO('bb' + 'a' * 1000)
+        assert auto.matcher().feed_file(file, 10).is_dead() and file.tell() == 10
+
+def test_accepts_words():
+    a: Automaton = Automaton()
+    a.add_state('0')
+    a.add_state('1')
+    a.add_state('2')
+    a.set_start('0')
+    a.make_state_final('2')
+    a.add_transition('0', 'a', '0')
+    a.add_transition('0', 'b', '0')
+    a.add_transition('0', 'a', '1')
+    a.add_transition('1', 'b', '2')
+    words = ['ab', 'aab', 'ba', '', 'ab', 'abc', 'bbab']
+    assert a.accepts_words(words) == [a.accepts_word(word) for word in words]
+    assert a.determinize().accepts_words(words) == [True, True, False, False, True, False, True]
+
 def test_is_deterministic():
     a: Automaton = Automaton()
     a.add_state('0')
@@ -227,6 +500,30 @@ def test_star():
     assert star.get_state('0') in star.starts
     assert star.get_state('2') in star.starts
 
+def test_copy_on_write():
+    a: Automaton = Automaton()
+    a.add_state('0')
+    a.add_state('1')
+    a.set_start('0')
+    a.make_state_final('1')
+    a.add_transition('0', 'a', '1')
+    copy: Automaton = a.copy()
+    assert copy.transitions[copy.get_state('0')] is a.transitions[a.get_state('0')]
+    copy.add_transition('0', 'b', '1')
+    copy.remove_transition('0', 'a', '1')
+    a.add_transition('1', 'a', '0')
+    assert a.accepts_word('a') and not a.accepts_word('b')
+    assert copy.accepts_word('b') and not copy.accepts_word('a')
+    assert not copy.accepts_word('aaa') and a.accepts_word('aaa')
+    copy.remove_state('1')
+    assert a.get_state('0') in a.get_state_predecessors(a.get_state('1'))['a']
+    star: Automaton = a.star()
+    union: Automaton = a.union(a.copy())
+    a.rename()
+    assert star.accepts_word('aaaaa') and not a.accepts_word('aa')
+    assert union.get_state('1') in union.get_state_transitions(union.get_state('0'))['a']
+    assert len(union.states) == 4 and union.accepts_word('a')
+
 def test_complement():
     a: Automaton = Automaton()
     a.add_state('0')
@@ -252,6 +549,105 @@ def test_complement_throws():
         a.make_state_final('1')
         a.complement()
 
+def product_operands():
+    a1: Automaton = Automaton()
+    for label in ['0', '1', '2']:
+        a1.add_state(label)
+    a1.set_start('0')
+    a1.make_state_final('1')
+    a1.add_transition('0', 'a', '1')
+    a1.add_transition('1', 'b', '1')
+    a1.add_transition('2', 'a', '2')
+    a2: Automaton = Automaton()
+    for label in ['x0', 'x1']:
+        a2.add_state(label)
+    a2.set_start('x0')
+    a2.make_state_final('x1')
+    a2.add_transition('x0', 'a', 'x0')
+    a2.add_transition('x0', 'b', 'x1')
+    a2.add_transition('x1', 'b', 'x1')
+    return a1, a2
+
+def test_intersection():
+    a1, a2 = product_operands()
+    intersection = a1.intersection(a2)
+    assert len(intersection.states) == 3
+    assert intersection.get_state('0') in intersection.starts
+    assert intersection.get_state('2') in intersection.finals
+    assert intersection.accepts_word('ab')
+    assert intersection.accepts_word('abbb')
+    assert not intersection.accepts_word('a')
+    assert not intersection.accepts_word('b')
+
+def test_product_operations():
+    a1, a2 = product_operands()
+    union = a1.product_union(a2)
+    difference = a1.difference(a2)
+    symmetric_difference = a1.symmetric_difference(a2)
+    for word in ['', 'a', 'ab', 'b', 'aab', 'abb', 'ba']:
+        in_1, in_2 = a1.accepts_word(word), a2.accepts_word(word)
+        assert union.accepts_word(word) == (in_1 or in_2)
+        assert difference.accepts_word(word) == (in_1 and not in_2)
+        assert symmetric_difference.accepts_word(word) == (in_1 != in_2)
+
+def test_product_throws():
+    with pytest.raises(ValueError):
+        a1, _ = product_operands()
+        a1.intersection(Automaton.by_letter('a').union(Automaton.by_letter('b')))
+
+def test_equivalent():
+    a1: Automaton = Automaton.by_letter('a').union(Automaton.by_letter('b')).star()
+    a2: Automaton = a1.determinize().minimize()
+    assert a1.equivalent(a2)
+    assert a1.distinguishing_word(a2) is None
+    a3: Automaton = a1.concat(Automaton.by_letter('a'))
+    assert not a1.equivalent(a3)
+    assert a1.distinguishing_word(a3) == ''
+    assert a3.distinguishing_word(a3.concat(Automaton.by_letter('b'))) == 'a'
+
+def test_includes():
+    a1: Automaton = Automaton.by_letter('a').union(Automaton.by_letter('b')).star()
+    a2: Automaton = Automaton.by_letter('a').concat(Automaton.by_letter('b').star())
+    assert a1.includes(a2)
+    assert a1.missing_word(a2) is None
+    assert not a2.includes(a1)
+    assert a2.missing_word(a1) == ''
+    assert a2.missing_word(a2.union(Automaton.by_letter('b'))) == 'b'
+
+def test_is_universal():
+    a: Automaton = Automaton.by_letter('a').union(Automaton.by_letter('b')).star()
+    assert a.is_universal()
+    assert not a.concat(Automaton.by_letter('a')).is_universal()
+    assert not Automaton.by_letter('a').is_universal()
+    b: Automaton = Automaton()
+    for label in ['0', '1', '2']:
+        b.add_state(label)
+    b.set_start('0')
+    b.make_state_final('0')
+    b.add_transition('0', 'a', '0')
+    b.add_transition('0', 'b', '0')
+    b.add_transition('0', 'a', '1')
+    b.add_transition('1', 'b', '2')
+    assert b.is_universal()
+    b.remove_transition('0', 'b', '0')
+    assert not b.is_universal()
+
+def test_includes_nondeterministic():
+    # (a+b)*ab(a+b)* as a non-deterministic automaton.
+    a: Automaton = Automaton()
+    for label in ['0', '1', '2']:
+        a.add_state(label)
+    a.set_start('0')
+    a.make_state_final('2')
+    for source, letter, target in [('0', 'a', '0'), ('0', 'b', '0'), ('0', 'a', '1'),
+                                   ('1', 'b', '2'), ('2', 'a', '2'), ('2', 'b', '2')]:
+        a.add_transition(source, letter, target)
+    b: Automaton = Automaton.by_letter('b').star().concat(Automaton.by_letter('a'))
+    assert a.missing_word(b.concat(Automaton.by_letter('b'))) is None
+    assert a.missing_word(b) == 'a'
+    assert a.missing_word(b.concat(Automaton.by_letter('a'))) == 'aa'
+    assert not a.includes(b)
+
 def test_determinize():
     a: Automaton = Automaton()
     a.add_state('0')
@@ -272,6 +668,28 @@ def test_determinize():
     assert determinize.get_state('0') in determinize.transitions[\
         determinize.get_state('0')]['b']
 
+def test_determinize_blowup():
+    # (a+b)*a(a+b)(a+b) needs 2^3 states when deterministic.
+    a: Automaton = Automaton()
+    for label in ['0', '1', '2', '3']:
+        a.add_state(label)
+    a.set_start('0')
+    a.make_state_final('3')
+    a.add_transition('0', 'a', '0')
+    a.add_transition('0', 'b', '0')
+    a.add_transition('0', 'a', '1')
+    for source, target in [('1', '2'), ('2', '3')]:
+        a.add_transition(source, 'a', target)
+        a.add_transition(source, 'b', target)
+    determinize = a.determinize()
+    assert len(determinize.states) == 8
+    assert determinize.is_deterministic()
+    assert determinize.is_total()
+    assert determinize.get_state('0') in determinize.starts
+    assert determinize.get_state('1') in determinize.transitions[determinize.get_state('0')]['a']
+    for word in ['abb', 'babab', 'aab', 'bba', 'abbb', '']:
+        assert determinize.accepts_word(word) == a.accepts_word(word)
+
 def test_minimize():
     a: Automaton = Automaton.by_letter('a')
     b: Automaton = Automaton.by_letter('b')
@@ -286,6 +704,62 @@ def test_minimize():
     assert sigma_star.get_state('0') in sigma_star.transitions[\
         sigma_star.get_state('0')]['b']
 
+def test_hopcroft_minimize():
+    a: Automaton = Automaton()
+    for label in ['0', '1', '2', '3', '4', '5']:
+        a.add_state(label)
+    a.set_start('0')
+    a.make_state_final('1')
+    a.make_state_final('2')
+    a.add_transition('0', 'a', '1')
+    a.add_transition('0', 'b', '2')
+    a.add_transition('1', 'a', '1')
+    a.add_transition('1', 'b', '3')
+    a.add_transition('2', 'a', '2')
+    a.add_transition('2', 'b', '3')
+    a.add_transition('3', 'a', '3')
+    a.add_transition('5', 'a', '0')
+    minimal = a.minimize()
+    assert len(minimal.states) == 3
+    assert minimal.is_total()
+    assert len(minimal.states) == len(a.brzozowski_minimize().states)
+    assert minimal.get_state('1') in minimal.transitions[minimal.get_state('0')]['a']
+    assert minimal.get_state('1') in minimal.transitions[minimal.get_state('0')]['b']
+    assert minimal.get_state('1') in minimal.finals
+    assert minimal.get_state('2') in minimal.transitions[minimal.get_state('1')]['b']
+    assert minimal.accepts_word('baaa')
+    assert not minimal.accepts_word('abab')
+
+def test_hopcroft_minimize_throws():
+    with pytest.raises(ValueError):
+        a: Automaton = Automaton.by_letter('a').union(Automaton.by_letter('b'))
+        a.hopcroft_minimize()
+
+def test_trim():
+    a: Automaton = Automaton()
+    for label in ['0', '1', '2', '3', '4']:
+        a.add_state(label)
+    a.set_start('0')
+    a.make_state_final('1')
+    a.add_transition('0', 'a', '1')
+    a.add_transition('0', 'b', '2')
+    a.add_transition('2', 'b', '2')
+    a.add_transition('3', 'a', '1')
+    a.add_transition('1', 'a', '4')
+    a.add_transition('4', 'b', '1')
+    assert a.trim() == 2 and a.trimmed == 2
+    assert [state.label for state in a.states] == ['0', '1', '4']
+    assert a.accepts_word('aab') and not a.accepts_word('b')
+    assert a.trim() == 0
+    assert a.union(a, trim=True) is not a
+    assert len(a.determinize().states) == 4
+    determinized: Automaton = a.determinize(trim=True)
+    assert len(determinized.states) == 3 and determinized.trimmed == 1
+    concat: Automaton = Automaton.by_letter('a').concat(a, trim=True)
+    assert concat.trimmed == 1
+    star: Automaton = concat.star(trim=True)
+    assert star.trimmed == 0 and star.accepts_word('aaabaa') and not star.accepts_word('aaaab')
+
 def test_reverse():
     a: Automaton = Automaton()
     a.add_state('0')
@@ -302,6 +776,55 @@ def test_reverse():
     assert reverse.get_state('1') in reverse.transitions[reverse.get_state('1')]['a']
     assert reverse.get_state('1') in reverse.transitions[reverse.get_state('1')]['b']
 
+def test_get_regex():
+    a: Automaton = Automaton()
+    for label in ['0', '1', '2', '3']:
+        a.add_state(label)
+    a.set_start('0')
+    a.make_state_final('2')
+    a.add_transition('0', 'a', '1')
+    a.add_transition('0', 'b', '0')
+    a.add_transition('1', 'b', '2')
+    a.add_transition('2', 'a', '2')
+    a.add_transition('1', 'a', '3')
+    assert a.get_regex() == 'b*aba*'
+
+def test_get_regex_language():
+    a: Automaton = Automaton()
+    for label in ['0', '1', '2']:
+        a.add_state(label)
+    a.set_start('0')
+    a.make_state_final('0')
+    a.make_state_final('2')
+    for source, letter, target in [('0', 'a', '1'), ('0', 'b', '2'), ('1', 'a', '2'),
+                                   ('1', 'b', '0'), ('2', 'a', '0'), ('2', 'b', '1')]:
+        a.add_transition(source, letter, target)
+    # The regex uses + for union and $ for the empty word.
+    regex = re.compile(a.get_regex().replace('+', '|').replace('$', ''))
+    words = [''.join(word) for length in range(7) for word in
+             itertools.product('ab', repeat=length)]
+    for word in words:
+        assert bool(regex.fullmatch(word)) == a.accepts_word(word)
+
+def test_reversed_view():
+    a: Automaton = Automaton()
+    a.add_state('0')
+    a.add_state('1')
+    a.set_start('0')
+    a.make_state_final('1')
+    a.add_transition('0', 'a', '1')
+    a.add_transition('1', 'b', '1')
+    view = a.reversed_view()
+    assert view.transitions is a.predecessors
+    assert view.get_state('1') in view.starts
+    assert view.accepts_word('bba')
+    assert not view.accepts_word('ab')
+    reverse = a.reverse()
+    assert reverse.get_state('1') in reverse.get_state_predecessors(reverse.get_state('0'))['a']
+    assert reverse.get_state('1') in reverse.get_state_transitions(reverse.get_state('1'))['b']
+    assert a.get_state('0') in a.get_state_predecessors(a.get_state('1'))['a']
+    assert not a.get_state_predecessors(a.get_state('0'))
+
 def test_stream_format():
     a: Automaton = Automaton()
     a.add_state('0')
@@ -140,6 +140,19 @@ def test_intersection():
         assert not c.intersection('A', 'B').accepts_word('aaaabbb')
         c.intersection('C', 'A')
 
+def test_equivalent():
+    with pytest.raises(KeyError):
+        c = Controller()
+        c.add_automaton('A', c.from_regex('(a+b)*'))
+        c.add_automaton('B', c.from_regex('(a*b*)*'))
+        c.add_automaton('C', c.from_regex('a*b*'))
+        assert c.equivalent('A', 'B')
+        assert not c.equivalent('A', 'C')
+        assert c.distinguishing_word('A', 'C') == 'ba'
+        assert c.includes('A', 'C')
+        assert not c.includes('C', 'A')
+        c.equivalent('A', 'D')
+
 def test_determinize():
     with pytest.raises(KeyError):
         c = Controller()
@@ -172,3 +185,45 @@ def test_reverse():
         assert not rev_auto.accepts_word('aaaabbb')
         c.reverse('B')
 
+def test_multi_matcher():
+    c = Controller()
+    regexes = {'A': "(a+b)*aba", 'B': "a*", 'C': "(ab)*", 'D': "b(a+b)*", 'F': "(a+b)*bb(a+b)*"}
+    for name, regex in regexes.items():
+        c.add_automaton(name, c.from_regex(regex))
+    c.add_automaton('E', c.from_regex("ab").union(c.from_regex("ba")))
+    matcher = c.multi_matcher()
+    assert matcher.matches("abbaba") == ['A', 'F']
+    assert matcher.matches("") == ['B', 'C']
+    assert matcher.matches("ab") == ['C', 'E']
+    assert matcher.matches("babababa") == ['A', 'D']
+    assert matcher.matches("abc") == []
+    assert c.accepting_automatons("aaa", ['A', 'B']) == ['B']
+    assert matcher.match_mask("aaa") == 0b10
+    words = ["abab", "baba", "", "a", "bb", "ababa", "ba", "abbaba", "bbbab", "aabbab"]
+    for word in words:
+        assert matcher.matches(word) == [name for name, auto in c.automatons.items()
+                                         if auto.accepts_word(word)]
+
+def test_multi_matcher_other_letters():
+    c = Controller()
+    for name, regex in {'any': "(a+b)*", 'has_bb': "(a+b)*bb(a+b)*"}.items():
+        c.add_automaton(name, c.from_regex(regex))
+    matcher = c.multi_matcher()
+    assert matcher.matches("bb") == ['any', 'has_bb']
+    for word in ["bbc", "c", "abbca", "abc"]:
+        assert matcher.matches(word) == [] and c.accepting_automatons(word) == []
+    # A trimmed automaton which is not total: its subsets become empty after 'a'.
+    c = Controller()
+    trimmed = c.from_regex("a(a+b)*")
+    trimmed.trim()
+    c.add_automaton('A', trimmed)
+    matcher = c.multi_matcher()
+    assert matcher.matches("ab") == ['A']
+    for word in ["abc", "ac", "abbac", "c"]:
+        assert matcher.matches(word) == [] and c.accepting_automatons(word) == []
+
+def test_multi_matcher_throws():
+    with pytest.raises(KeyError):
+        c = Controller()
+        c.add_automaton('A', c.from_regex("a"))
+        c.multi_matcher(['A', 'B'])
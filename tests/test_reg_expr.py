@@ -1,5 +1,9 @@
+import pytest
 from src.regexpr.reg_expr import RegExpr
+from src.regexpr.parser import RegexSyntaxError, parse
+from src.regexpr.derivatives import derivative, normalize
 from src.automaton.automaton import Automaton
+from src.regexpr.lexer import Lexer, LexerError, Token
 
 def test_validate():
     regex = RegExpr("(a+b)*aba(a+b)*")
@@ -11,6 +15,48 @@ def test_validate():
     regex = RegExpr("(a+b)()")
     assert not regex.validate()
 
+def test_validate_long():
+    regex = RegExpr("(" + "+".join(["ab"] * 5000) + ")*")
+    assert regex.validate()
+    regex = RegExpr("a" * 40 + "+")
+    assert not regex.validate()
+
+def test_parse():
+    tree = parse("(a+b)*a$")
+    assert str(tree) == "(a+b)*a$"
+    assert tree.kind == "."
+    assert [child.kind for child in tree.children] == ["*", "letter", "$"]
+    assert tree == parse("((a+b))*a$")
+    for regex, position in [("(a++b)", 3), ("a)", 1), ("(a", 2), ("a#", 1), ("", 0)]:
+        with pytest.raises(RegexSyntaxError) as error:
+            parse(regex)
+        assert error.value.position == position
+
+def test_deep_nesting():
+    regex = RegExpr("(" * 3000 + "a" + ")" * 3000)
+    assert regex.validate() and regex.matches("a") and regex.convert_in_rpn() == "a"
+    with pytest.raises(RegexSyntaxError) as error:
+        parse("(" * 3000 + "a")
+    assert error.value.position == 3001
+    # ((a*b)*b)*b... with 300 stars, every word ends with b and has no a after a b.
+    deep = "a"
+    for _ in range(300):
+        deep = f"({deep})*b"
+    regex = RegExpr(deep)
+    assert regex.validate() and str(regex.parse()) == deep.replace("(a)*", "a*")
+    assert regex.convert_in_rpn() == "a*b." + "*b." * 299
+    words = ["b" * 300, "a" + "b" * 300, "b", "ab", "b" * 300 + "a"]
+    assert regex.compile().accepts_words(words) == [True, True, True, False, False]
+    # a(b+a(b+...(b+c)...)) keeps its depth in every derivative.
+    regex = RegExpr("a(b+" * 3000 + "c" + ")" * 3000)
+    words = ["ab", "a" * 3000 + "c", "a" * 3000 + "b", "a" * 3001 + "c", "a" * 3000]
+    assert [regex.matches(word) for word in words] == [True, True, True, False, False]
+
+def test_convert_in_rpn():
+    assert RegExpr("(a+b)*aba(a+b)*").convert_in_rpn() == "ab+*a.b.a.ab+*."
+    assert RegExpr("a+b+c").convert_in_rpn() == "ab+c+"
+    assert RegExpr("(ab)(cd)").convert_in_rpn() == "ab.cd.."
+
 def test_compile():
     regex = RegExpr("(a+b)*aba(a+b)*")
     a = regex.compile()
@@ -25,3 +71,108 @@ def test_compile():
     assert a.get_state('0') in a.starts
     assert a.is_deterministic()
     assert a.is_total()
+
+def test_glushkov():
+    a = RegExpr("(a+b)*aba(a+b)*").glushkov()
+    assert len(a.states) == 8
+    assert a.get_state('0') in a.starts
+    assert a.get_state('1') in a.transitions[a.get_state('0')]['a']
+    assert a.get_state('3') in a.transitions[a.get_state('1')]['a']
+    assert a.get_state('4') in a.transitions[a.get_state('3')]['b']
+    assert a.get_state('7') in a.transitions[a.get_state('5')]['b']
+    assert {state.label for state in a.finals} == {'5', '6', '7'}
+    assert not a.get_state('0') in a.finals
+    assert a.accepts_word("bbbababbb")
+    assert not a.accepts_word("ab")
+    epsilon = RegExpr("(a+$)*").glushkov()
+    assert len(epsilon.states) == 2
+    assert epsilon.accepts_word("")
+    assert epsilon.accepts_word("aaa")
+
+def test_compile_not_minimized():
+    a = RegExpr("(a+b)*aba(a+b)*").compile(minimize=False)
+    assert len(a.states) == 8
+    assert not a.is_deterministic()
+    assert len(RegExpr("(a+b)*aba(a+b)*").kleene_compile().states) == 4
+
+def test_compile_trimmed():
+    a = RegExpr("ab+ba").compile()
+    trimmed = RegExpr("ab+ba").compile(trim=True)
+    assert trimmed.trimmed == 1
+    assert len(trimmed.states) == len(a.states) - 1
+    words = ["ab", "ba", "aa", "", "abb", "b"]
+    assert trimmed.accepts_words(words) == a.accepts_words(words) == \
+        [True, True, False, False, False, False]
+
+@pytest.mark.parametrize('regex, text, spans', [
+    ("ab*", "xxabbbcab a", [(2, 6), (7, 9), (10, 11)]),
+    ("a+abc", "abcabc", [(0, 3), (3, 6)]),
+    ("a*", "baab", [(0, 0), (1, 3), (3, 3), (4, 4)]),
+    ("(a+b)*c", "abcxbbc", [(0, 3), (4, 7)]),
+    ("ab+ba", "ccc", []),
+])
+def test_finditer(regex, text, spans):
+    for auto in [RegExpr(regex).compile(), RegExpr(regex).glushkov()]:
+        assert list(auto.finditer(text)) == spans
+        assert auto.search(text) == (spans[0] if spans else None)
+
+def test_finditer_nfa():
+    # Many finals and a start with two targets on one letter in the reversed automaton.
+    edges = [(0, 'a', 0), (0, 'b', 0), (1, 'a', 2), (1, 'b', 3),
+             (2, 'a', 1), (2, 'a', 2), (2, 'a', 3), (3, 'b', 0)]
+    for _ in range(50):
+        auto = Automaton.from_edges(4, edges, [1], [0, 2, 3])
+        assert auto.search('ab') == (0, 1)
+        assert list(auto.finditer('ab')) == [(0, 1), (1, 2)]
+        assert list(auto.finditer('aab')) == [(0, 3)]
+
+def test_lexer():
+    lexer = Lexer([("IF", "if"), ("ID", "(a+b+f+i+x)(a+b+f+i+x+0+1)*"), ("NUM", "(0+1)(0+1)*"),
+                   ("PLUS", Automaton.by_letter('+'))], skip=" \n")
+    text = "if iff x1 + 101 +if\n ab1"
+    tokens = list(lexer.tokenize(text))
+    assert tokens == [Token("IF", "if", 0), Token("ID", "iff", 3), Token("ID", "x1", 7),
+                      Token("PLUS", "+", 10), Token("NUM", "101", 12), Token("PLUS", "+", 16),
+                      Token("IF", "if", 17), Token("ID", "ab1", 21)]
+    for size in range(1, 6):
+        chunks = [text[start:start + size] for start in range(0, len(text), size)]
+        assert list(lexer.tokenize_stream(chunks)) == tokens
+    assert not list(lexer.tokenize("  "))
+
+@pytest.mark.parametrize('text, position', [("ab ? b", 3), ("ab c", 3), ("bbaba?", 5)])
+def test_lexer_throws(text, position):
+    lexer = Lexer([("A", "a(ab)*"), ("B", "b*"), ("AB", "ab")], skip=" ")
+    with pytest.raises(LexerError) as error:
+        list(lexer.tokenize(text))
+    assert error.value.position == position
+
+def test_derivative():
+    regex = normalize(parse("(b+a)*ab"))
+    assert str(regex) == "(a+b)*ab"
+    assert str(derivative(regex, 'a')) == "(a+b)*ab+b"
+    assert str(derivative(derivative(regex, 'a'), 'b')) == "$+(a+b)*ab"
+    assert str(derivative(regex, 'c')) == ""
+
+def test_matches():
+    regex = RegExpr("(a+b)*aba(a+b)*")
+    assert regex.matches("bbbababbb")
+    assert regex.matches("aba")
+    assert not regex.matches("ab")
+    assert not regex.matches("abac")
+    regex.regex = "a*"
+    assert regex.matches("aaa")
+    assert not regex.matches("aba")
+
+def test_matcher_cache():
+    matcher = RegExpr("(a+b)*a(a+b)(a+b)").matcher(max_states=4)
+    words = ["aaa", "abb", "bab", "bbbaab", "aabba", "b"]
+    assert [matcher.matches(word) for word in words] == [True, True, False, True, False, False]
+    assert len(matcher) <= 4
+    matcher = RegExpr("(a+b)*a(a+b)(a+b)").matcher()
+    assert [matcher.matches(word) for word in words] == [True, True, False, True, False, False]
+    # Only the states visited by the words are built.
+    assert len(matcher) == 7
+
+def test_compile_throws():
+    with pytest.raises(ValueError):
+        RegExpr("(a+b)()").compile()